@@ -0,0 +1,8 @@
+# Load the Celery app with Django so @shared_task binds to it; Celery is
+# only installed where a durable job queue is deployed
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ("celery_app",)
@@ -0,0 +1,18 @@
+"""
+Celery application for the audio_separator project.
+
+Workers are started with ``celery -A audio_separator worker`` and pick up
+the separation pipeline tasks declared in each app's ``tasks`` module.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "audio_separator.settings")
+
+app = Celery("audio_separator")
+
+# Read every CELERY_* setting from Django settings
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -185,7 +185,7 @@ ALLOWED_AUDIO_FORMATS = ['.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg']
 WHISPERX_MODEL = "base"  # Options: tiny, base, small, medium, large-v2
 WHISPERX_DEVICE = "cpu"  # Change to "cuda" if GPU available
 WHISPERX_BATCH_SIZE = 16
-WHISPERX_COMPUTE_TYPE = "float32"
+WHISPERX_COMPUTE_TYPE = "int8_float16" if WHISPERX_DEVICE == "cuda" else "int8"  # CTranslate2 INT8 kernels
 
 # Speaker diarization settings
 DIARIZATION_MIN_SPEAKERS = 1  # Minimum number of speakers to detect
@@ -211,10 +211,6 @@ else:
 MAX_CONCURRENT_JOBS = 2
 JOB_TIMEOUT_SECONDS = 3600  # 1 hour
 
-# Create necessary directories
-for path in [AUDIO_UPLOAD_PATH, AUDIO_OUTPUT_PATH, AUDIO_TEMP_PATH]:
-    path.mkdir(parents=True, exist_ok=True)
-
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -8,6 +8,12 @@ import logging
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+
+def _envbool(name, default='False'):
+    """Read a boolean flag from the environment"""
+    return os.environ.get(name, default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 # SECURITY WARNING: keep the secret key used in production secret!
 # In production, use environment variables
 SECRET_KEY = os.environ.get(
@@ -16,9 +22,13 @@ SECRET_KEY = os.environ.get(
 )
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.environ.get('DJANGO_DEBUG', 'True').lower() == 'true'
+DEBUG = _envbool('DJANGO_DEBUG', 'True')
 
-ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+    if host.strip()
+]
 
 # Application definition
 INSTALLED_APPS = [
@@ -47,13 +57,20 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Compiled templates are kept in memory; the autoreloader still
+            # resets this cache when templates change under DEBUG
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
         },
     },
 ]
@@ -67,7 +84,21 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
         "OPTIONS": {
             'timeout': 30,
-        }
+            # WAL lets status polling read while workers write job progress
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA mmap_size=268435456;'
+                'PRAGMA cache_size=-64000;'
+                'PRAGMA busy_timeout=30000;'
+            ),
+            # Take the write lock up front instead of failing on lock upgrade
+            'transaction_mode': 'IMMEDIATE',
+        },
+        "CONN_MAX_AGE": 60,
+        # Verify a reused connection once per request instead of failing the status poll
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -136,24 +167,28 @@ AUDIO_UPLOAD_PATH = MEDIA_ROOT / 'uploads'
 AUDIO_OUTPUT_PATH = MEDIA_ROOT / 'outputs'
 AUDIO_TEMP_PATH = MEDIA_ROOT / 'temp'
 
+# Internal nginx location aliased to AUDIO_OUTPUT_PATH; when set, speaker tracks
+# are sent by nginx via X-Accel-Redirect instead of streamed through Django
+AUDIO_ACCEL_REDIRECT_PREFIX = os.environ.get('AUDIO_ACCEL_REDIRECT_PREFIX')
+
 # WhisperX model settings
 WHISPERX_MODEL = os.environ.get('WHISPERX_MODEL', 'base')
 WHISPERX_DEVICE = os.environ.get('WHISPERX_DEVICE', 'cpu')  # Change to "cuda" if GPU available
 WHISPERX_BATCH_SIZE = int(os.environ.get('WHISPERX_BATCH_SIZE', 16))
-WHISPERX_COMPUTE_TYPE = os.environ.get('WHISPERX_COMPUTE_TYPE', 'float32')
+WHISPERX_COMPUTE_TYPE = os.environ.get(
+    'WHISPERX_COMPUTE_TYPE', 'int8_float16' if WHISPERX_DEVICE == 'cuda' else 'int8'
+)
 
 # Processing settings
 MAX_CONCURRENT_JOBS = int(os.environ.get('MAX_CONCURRENT_JOBS', 2))
 JOB_TIMEOUT_SECONDS = int(os.environ.get('JOB_TIMEOUT_SECONDS', 3600))  # 1 hour
 
 # Security settings for file validation
-VALIDATE_FILE_EXISTS = os.environ.get('VALIDATE_FILE_EXISTS', 'False').lower() == 'true'
-
-# Create necessary directories
-for path in [AUDIO_UPLOAD_PATH, AUDIO_OUTPUT_PATH, AUDIO_TEMP_PATH]:
-    path.mkdir(parents=True, exist_ok=True)
+VALIDATE_FILE_EXISTS = _envbool('VALIDATE_FILE_EXISTS')
 
 # Logging Configuration
+LOG_FILE = BASE_DIR / 'logs' / 'audio_separator.log'
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -179,10 +214,12 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple'
         },
+        # Non-blocking: records are queued here and written to LOG_FILE by a
+        # listener thread started in ProcessorConfig.ready()
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'logs' / 'audio_separator.log',
+            'class': 'logging.handlers.QueueHandler',
+            'queue': 'ext://processor.log_queue.log_queue',
             'formatter': 'verbose',
         },
     },
@@ -203,47 +240,80 @@ LOGGING = {
     },
 }
 
-# Create logs directory
-(BASE_DIR / 'logs').mkdir(exist_ok=True)
-
-# Cache Configuration (for production, use Redis)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'audio-separator-cache',
-        'TIMEOUT': 300,  # 5 minutes
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
+# Cache Configuration
+# Redis is shared across workers; fall back to a per-process cache when it is not configured
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,  # e.g. redis://127.0.0.1:6379/1 or unix:///var/run/redis/redis.sock
+            'TIMEOUT': 300,  # 5 minutes
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'CONNECTION_POOL_KWARGS': {'max_connections': 50},
+                'SOCKET_CONNECT_TIMEOUT': 2,
+                'SOCKET_TIMEOUT': 2,
+                'IGNORE_EXCEPTIONS': True,
+            }
         }
     }
-}
+
+    # Keep sessions in the same Redis pool instead of the database
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    SESSION_CACHE_ALIAS = 'default'
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'audio-separator-cache',
+            'TIMEOUT': 300,  # 5 minutes
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            }
+        }
+    }
+
+    # A per-process cache cannot hold sessions, so keep them client-side
+    # rather than writing a django_session row on every request
+    SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# Celery Configuration
+# Separation jobs run on Celery workers when a broker is configured, so they survive
+# web worker restarts; without one they fall back to in-process threads
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', REDIS_URL)
+CELERY_TASK_ACKS_LATE = True  # Redeliver jobs whose worker died mid-run
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Jobs are minutes long; don't hoard them
+CELERY_TASK_IGNORE_RESULT = True  # Progress lives in the job row; nobody reads task results
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
 
 # Email Configuration (for production notifications)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
-EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True').lower() == 'true'
+EMAIL_USE_TLS = _envbool('EMAIL_USE_TLS', 'True')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@audioseparator.local')
 
 # File Upload Settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
+# Audio uploads are always megabytes, so stream every upload to a temp file
+# under AUDIO_TEMP_PATH instead of buffering it in RAM
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+FILE_UPLOAD_TEMP_DIR = str(AUDIO_TEMP_PATH)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
-DATA_UPLOAD_MAX_NUMBER_FIELDS = 100
-
-# Performance Settings
-USE_TZ = True
-USE_L10N = True
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 10  # Largest form posts a handful of fields
+DATA_UPLOAD_MAX_NUMBER_FILES = 1  # One audio file per upload
 
 # Development vs Production specific settings
 if DEBUG:
     # Development settings
     INTERNAL_IPS = ['127.0.0.1', 'localhost']
     
-    # Add development middleware
-    INSTALLED_APPS += ['django.contrib.staticfiles']
-    
 else:
     # Production settings
     SECURE_SSL_REDIRECT = True
@@ -259,7 +329,18 @@ else:
     # Database for production (example PostgreSQL configuration)
     if os.environ.get('DATABASE_URL'):
         import dj_database_url
-        DATABASES['default'] = dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        DATABASES['default'] = dj_database_url.parse(
+            os.environ.get('DATABASE_URL'), conn_max_age=60, conn_health_checks=True
+        )
+        
+        # psycopg 3 connection pool, shared by the status-poll hot path; Django
+        # requires persistent connections to be off when the pool is enabled
+        if _envbool('DATABASE_POOL'):
+            DATABASES['default']['CONN_MAX_AGE'] = 0
+            DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+                'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 4)),
+                'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 20)),
+            }
 
 # Async Settings (for future ASGI deployment)
 ASGI_APPLICATION = "audio_separator.asgi.application"
@@ -269,13 +350,13 @@ RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = 'default'
 
 # Custom settings for the application
-AUDIO_PROCESSING_ENABLED = os.environ.get('AUDIO_PROCESSING_ENABLED', 'True').lower() == 'true'
-DEMO_MODE = os.environ.get('DEMO_MODE', 'False').lower() == 'true'
+AUDIO_PROCESSING_ENABLED = _envbool('AUDIO_PROCESSING_ENABLED', 'True')
+DEMO_MODE = _envbool('DEMO_MODE')
 
 # Health check settings
 HEALTH_CHECK_ENABLED = True
 HEALTH_CHECK_URL = '/health/'
 
 # Monitoring and metrics
-ENABLE_METRICS = os.environ.get('ENABLE_METRICS', 'False').lower() == 'true'
+ENABLE_METRICS = _envbool('ENABLE_METRICS')
 METRICS_URL = '/metrics/'
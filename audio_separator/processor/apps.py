@@ -1,7 +1,37 @@
 from django.apps import AppConfig
+from django.conf import settings
+import os
 import signal
 import sys
 import logging
+import threading
+from concurrent.futures import wait
+
+
+_DIRS_READY = False
+
+# Set from the signal handler; the shutdown thread does the actual work
+_SHUTDOWN = threading.Event()
+_SHUTDOWN_THREAD_STARTED = False
+_shutdown_signum = None
+SHUTDOWN_JOIN_TIMEOUT = 5  # seconds to wait for each job thread
+
+
+def ensure_audio_directories():
+    """Create the upload, output and temp directories once per process"""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
+    for path in (settings.AUDIO_UPLOAD_PATH, settings.AUDIO_OUTPUT_PATH, settings.AUDIO_TEMP_PATH):
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            path.mkdir(parents=True, exist_ok=True)
+    
+    _DIRS_READY = True
 
 
 class ProcessorConfig(AppConfig):
@@ -9,47 +39,74 @@ class ProcessorConfig(AppConfig):
     name = "processor"
     
     def ready(self):
-        """Called when the app is ready. Set up signal handlers."""
+        """Called when the app is ready. Create media directories, start file logging and set up signal handlers."""
+        ensure_audio_directories()
+        
+        # Cache invalidation for deleted or changed jobs and tracks
+        from . import signals  # noqa: F401
+        
+        # Settings that log through the queue handler name the file to drain it into
+        log_file = getattr(settings, 'LOG_FILE', None)
+        if log_file:
+            from .log_queue import start_file_listener
+            start_file_listener(log_file)
+        
         self.setup_signal_handlers()
+        
+        # Opt-in so management commands don't pay for the WhisperX import
+        if os.environ.get('PREWARM_MODEL', '0') == '1':
+            from .services import audio_service
+            audio_service.warm_up()
     
     def setup_signal_handlers(self):
         """Set up signal handlers for graceful shutdown"""
+        global _SHUTDOWN_THREAD_STARTED
         logger = logging.getLogger(__name__)
         
-        def signal_handler(signum, frame):
-            """Handle SIGINT (Ctrl+C) and SIGTERM signals"""
+        def shutdown_jobs():
+            """Wait for a shutdown signal, then cancel running jobs and wait for their threads"""
+            _SHUTDOWN.wait()
+            signum = _shutdown_signum
             signal_name = 'SIGINT' if signum == signal.SIGINT else 'SIGTERM'
             logger.info(f"Received {signal_name}, cancelling all running jobs and shutting down gracefully...")
             
             try:
                 # Import here to avoid circular imports
-                from .services import job_statuses, job_cancellations, job_threads, audio_service
+                from .services import job_registry, audio_service
                 
-                # Cancel all running jobs
-                running_jobs = [job_id for job_id, status in job_statuses.items() 
-                               if status.get('status') == 'processing']
+                # cancel_job() forgets the future, so snapshot them first
+                running_jobs = job_registry.items('future')
                 
                 if running_jobs:
-                    logger.info(f"Cancelling {len(running_jobs)} running jobs: {running_jobs}")
+                    logger.info(f"Cancelling {len(running_jobs)} running jobs: {[job_id for job_id, _ in running_jobs]}")
                     
-                    for job_id in running_jobs:
+                    for job_id, _ in running_jobs:
                         try:
                             audio_service.cancel_job(job_id)
                             logger.info(f"Cancelled job {job_id}")
                         except Exception as e:
                             logger.error(f"Error cancelling job {job_id}: {e}")
                     
-                    # Wait a moment for jobs to clean up
-                    import time
-                    time.sleep(1)
+                    # Wait only as long as the workers actually need to stop
+                    wait([future for _, future in running_jobs], timeout=SHUTDOWN_JOIN_TIMEOUT)
                 
                 logger.info("All jobs cancelled. Shutting down.")
                 
             except Exception as e:
-                logger.error(f"Error during signal handling: {e}")
+                logger.error(f"Error during shutdown: {e}")
             
-            # Exit gracefully
-            sys.exit(0)
+            # Deliver the signal again so the main thread exits through signal_handler
+            os.kill(os.getpid(), signum)
+        
+        def signal_handler(signum, frame):
+            """Handle SIGINT (Ctrl+C) and SIGTERM signals"""
+            global _shutdown_signum
+            if _SHUTDOWN.is_set():
+                # Cleanup finished, or a second signal asked us to stop waiting
+                sys.exit(0)
+            
+            _shutdown_signum = signum
+            _SHUTDOWN.set()
         
         # Register signal handlers for both SIGINT (Ctrl+C) and SIGTERM
         try:
@@ -64,3 +121,8 @@ class ProcessorConfig(AppConfig):
                 logger.info("Signal handler registered for SIGINT only")
             except Exception as e2:
                 logger.error(f"Could not register SIGINT handler: {e2}")
+                return
+        
+        if not _SHUTDOWN_THREAD_STARTED:
+            threading.Thread(target=shutdown_jobs, name='processor-shutdown', daemon=True).start()
+            _SHUTDOWN_THREAD_STARTED = True
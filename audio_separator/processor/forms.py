@@ -1,7 +1,42 @@
 from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
+import io
 import os
+import re
+
+
+_SAFE_NAME_RE = re.compile(r'[^\w\-_\.]')
+_LABEL_RE = re.compile(r'^[a-zA-Z0-9\s\-_]+$')
+
+# Upload limits resolved once instead of through LazySettings on every upload
+_MAX_UPLOAD = settings.MAX_UPLOAD_SIZE
+_MAX_UPLOAD_MB = _MAX_UPLOAD / (1024 * 1024)
+_ALLOWED_EXTS = frozenset(settings.ALLOWED_AUDIO_FORMATS)
+_ALLOWED_EXTS_STR = ', '.join(settings.ALLOWED_AUDIO_FORMATS)
+
+# Magic numbers for supported audio formats, keyed by prefix length
+_MAGIC4 = {b'RIFF': '.wav', b'fLaC': '.flac', b'OggS': '.ogg', b'ftyp': '.m4a'}
+_MAGIC3 = {b'ID3': '.mp3', b'\x00\x00\x00': '.m4a'}
+_MAGIC2 = {
+    b'\xff\xfb': '.mp3', b'\xff\xf3': '.mp3', b'\xff\xf2': '.mp3',
+    b'\xff\xf1': '.aac', b'\xff\xf9': '.aac',
+}
+_SNIFFED_EXTS = frozenset({*_MAGIC4.values(), *_MAGIC3.values(), *_MAGIC2.values()})
+
+
+def _read_header(uploaded_file, size=16):
+    """Peek at the first bytes of an upload without moving its cursor"""
+    f = uploaded_file.file
+    if isinstance(f, io.BytesIO):
+        with f.getbuffer() as view:
+            return bytes(view[:size])
+    pos = f.tell()
+    if pos:
+        f.seek(0)
+    header = f.read(size)
+    f.seek(pos)
+    return header
 
 
 class FileUploadForm(forms.Form):
@@ -22,63 +57,47 @@ class FileUploadForm(forms.Form):
         if not audio_file:
             raise ValidationError("Please select an audio file.")
         
+        name = audio_file.name
+        size = audio_file.size
+        ext = os.path.splitext(name)[1].lower()
+        
         # Check file size
-        if audio_file.size > settings.MAX_UPLOAD_SIZE:
-            max_size_mb = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
+        if size > _MAX_UPLOAD:
             raise ValidationError(
-                f"File size must be less than {max_size_mb:.1f}MB. "
-                f"Your file is {audio_file.size / (1024 * 1024):.1f}MB."
+                f"File size must be less than {_MAX_UPLOAD_MB:.1f}MB. "
+                f"Your file is {size / (1024 * 1024):.1f}MB."
             )
         
         # Check minimum file size (prevent empty or malicious tiny files)
-        if audio_file.size < 1024:  # 1KB minimum
+        if size < 1024:  # 1KB minimum
             raise ValidationError("File is too small to be a valid audio file.")
         
         # Sanitize filename to prevent path traversal
-        import re
-        safe_filename = re.sub(r'[^\w\-_\.]', '', audio_file.name)
-        if not safe_filename or safe_filename != audio_file.name:
+        safe_filename = _SAFE_NAME_RE.sub('', name)
+        if not safe_filename or safe_filename != name:
             raise ValidationError(
                 "Filename contains invalid characters. Use only letters, numbers, hyphens, underscores, and dots."
             )
         
         # Check file extension
-        file_extension = os.path.splitext(audio_file.name)[1].lower()
-        if file_extension not in settings.ALLOWED_AUDIO_FORMATS:
+        if ext not in _ALLOWED_EXTS:
             raise ValidationError(
-                f"File format not supported. Supported formats: "
-                f"{', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+                f"File format not supported. Supported formats: {_ALLOWED_EXTS_STR}"
             )
         
         # Validate file content by checking magic numbers/signatures
-        audio_file.seek(0)  # Reset file pointer
-        header = audio_file.read(16)  # Read first 16 bytes
-        audio_file.seek(0)  # Reset again
-        
-        # Define magic numbers for supported audio formats
-        magic_numbers = {
-            '.mp3': [b'ID3', b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'],
-            '.wav': [b'RIFF'],
-            '.flac': [b'fLaC'],
-            '.m4a': [b'\x00\x00\x00', b'ftyp'],
-            '.aac': [b'\xff\xf1', b'\xff\xf9'],
-            '.ogg': [b'OggS']
-        }
+        header = _read_header(audio_file)  # First 16 bytes
         
-        expected_magic = magic_numbers.get(file_extension, [])
-        if expected_magic:
-            valid_header = any(header.startswith(magic) for magic in expected_magic)
-            if not valid_header:
-                raise ValidationError(
-                    f"File content does not match the {file_extension} format. "
-                    "The file may be corrupted or not a genuine audio file."
-                )
+        detected = _MAGIC4.get(header[:4]) or _MAGIC3.get(header[:3]) or _MAGIC2.get(header[:2])
+        if ext in _SNIFFED_EXTS and detected != ext:
+            raise ValidationError(
+                f"File content does not match the {ext} format. "
+                "The file may be corrupted or not a genuine audio file."
+            )
         
-        # Additional content validation for specific formats
-        if file_extension == '.wav' and len(header) >= 12:
-            # WAV files should have 'WAVE' at offset 8
-            if header[8:12] != b'WAVE':
-                raise ValidationError("Invalid WAV file format.")
+        # WAV files should have 'WAVE' at offset 8
+        if ext == '.wav' and len(header) >= 12 and header[8:12] != b'WAVE':
+            raise ValidationError("Invalid WAV file format.")
         
         return audio_file
 
@@ -103,8 +122,7 @@ class SpeakerLabelForm(forms.Form):
         # Remove any potentially harmful characters
         if label:
             # Allow only alphanumeric, spaces, hyphens, and underscores
-            import re
-            if not re.match(r'^[a-zA-Z0-9\s\-_]+$', label):
+            if not _LABEL_RE.match(label):
                 raise ValidationError(
                     "Speaker label can only contain letters, numbers, spaces, hyphens, and underscores."
                 )
@@ -1,5 +1,7 @@
+import io
 import os
 import re
+from uuid import UUID
 from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -7,6 +9,49 @@ from django.core.validators import RegexValidator
 from django.utils.html import escape
 
 
+_FILENAME_RE = re.compile(r'^[a-zA-Z0-9\s\-_\.]+$')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SEARCH_STRIP_RE = re.compile(r'[^\w\s\-_\.]')
+
+# Upload limits resolved once instead of through LazySettings on every upload
+_MAX_UPLOAD = settings.MAX_UPLOAD_SIZE
+_MAX_UPLOAD_MB = _MAX_UPLOAD / (1024 * 1024)
+_ALLOWED_EXTS = frozenset(settings.ALLOWED_AUDIO_FORMATS)
+_ALLOWED_EXTS_STR = ', '.join(settings.ALLOWED_AUDIO_FORMATS)
+
+# Known audio file signatures, grouped by prefix length
+_AUDIO_SIGNATURES_4 = frozenset({b'RIFF', b'fLaC', b'OggS'})  # WAV, FLAC, OGG
+_AUDIO_SIGNATURES_3 = frozenset({b'ID3'})  # MP3
+_AUDIO_SIGNATURES_2 = frozenset({b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'})  # MP3 without ID3
+_AUDIO_SIGNATURES_LONG = (b'\x00\x00\x00\x20ftypM4A', b'\x00\x00\x00\x18ftypmp42')  # M4A, MP4
+
+# Speaker names reserved for the system
+_BANNED_LABELS = frozenset({'admin', 'root', 'system', 'null', 'undefined'})
+
+# Single characters that are never allowed in uploaded filenames
+_BAD_CHARS_TABLE = str.maketrans('', '', '/\\:*?"<>|\x00')
+
+# Bytes allowed in uploaded filenames: ASCII letters, digits, whitespace, hyphens, underscores and dots
+_FILENAME_ALLOWED_BYTES = (
+    b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f-_.'
+)
+
+
+def _read_header(uploaded_file, size=16):
+    """Peek at the first bytes of an upload without moving its cursor"""
+    f = uploaded_file.file
+    if isinstance(f, io.BytesIO):
+        with f.getbuffer() as view:
+            return bytes(view[:size])
+    pos = f.tell()
+    if pos:
+        f.seek(0)
+    header = f.read(size)
+    f.seek(pos)
+    return header
+
+
 class FileUploadForm(forms.Form):
     """Enhanced form for audio file upload with comprehensive validation"""
     
@@ -17,8 +62,8 @@ class FileUploadForm(forms.Form):
             'id': 'audioFileInput',
             'aria-describedby': 'fileHelpText'
         }),
-        help_text=f"Supported formats: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}. "
-                  f"Maximum size: {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB."
+        help_text=f"Supported formats: {_ALLOWED_EXTS_STR}. "
+                  f"Maximum size: {_MAX_UPLOAD // (1024 * 1024)}MB."
     )
     
     def clean_audio_file(self):
@@ -28,27 +73,29 @@ class FileUploadForm(forms.Form):
         if not audio_file:
             raise ValidationError("Please select an audio file.")
         
+        name = audio_file.name
+        size = audio_file.size
+        ext = os.path.splitext(name)[1].lower()
+        
         # Validate file size
-        if audio_file.size > settings.MAX_UPLOAD_SIZE:
-            max_size_mb = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
+        if size > _MAX_UPLOAD:
             raise ValidationError(
-                f"File size must be less than {max_size_mb:.1f}MB. "
-                f"Your file is {audio_file.size / (1024 * 1024):.1f}MB."
+                f"File size must be less than {_MAX_UPLOAD_MB:.1f}MB. "
+                f"Your file is {size / (1024 * 1024):.1f}MB."
             )
         
         # Validate minimum file size (prevent empty files)
-        if audio_file.size < 1024:  # 1KB minimum
+        if size < 1024:  # 1KB minimum
             raise ValidationError("The uploaded file is too small to be a valid audio file.")
         
         # Validate filename
-        self._validate_filename(audio_file.name)
+        self._validate_filename(name)
         
         # Validate file extension
-        file_extension = os.path.splitext(audio_file.name)[1].lower()
-        if file_extension not in settings.ALLOWED_AUDIO_FORMATS:
+        if ext not in _ALLOWED_EXTS:
             raise ValidationError(
-                f"File format '{file_extension}' not supported. "
-                f"Supported formats: {', '.join(settings.ALLOWED_AUDIO_FORMATS)}"
+                f"File format '{ext}' not supported. "
+                f"Supported formats: {_ALLOWED_EXTS_STR}"
             )
         
         # Validate file content (basic header check)
@@ -62,8 +109,7 @@ class FileUploadForm(forms.Form):
             raise ValidationError("Invalid filename.")
         
         # Check for dangerous characters
-        dangerous_chars = ['..', '/', '\\', ':', '*', '?', '"', '<', '>', '|', '\x00']
-        if any(char in filename for char in dangerous_chars):
+        if len(filename.translate(_BAD_CHARS_TABLE)) != len(filename) or '..' in filename:
             raise ValidationError(
                 "Filename contains invalid characters. Please rename your file."
             )
@@ -76,8 +122,9 @@ class FileUploadForm(forms.Form):
         if filename.startswith('.') or filename.startswith('~'):
             raise ValidationError("Hidden or system files are not allowed.")
         
-        # Validate filename pattern (letters, numbers, spaces, hyphens, underscores, dots)
-        if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', filename):
+        # Validate filename pattern (letters, numbers, spaces, hyphens, underscores, dots);
+        # deleting every allowed byte leaves nothing behind for a valid name
+        if filename.encode('utf-8', 'replace').translate(None, _FILENAME_ALLOWED_BYTES):
             raise ValidationError(
                 "Filename can only contain letters, numbers, spaces, hyphens, underscores, and dots."
             )
@@ -86,31 +133,14 @@ class FileUploadForm(forms.Form):
         """Validate file content by checking headers"""
         try:
             # Read first 16 bytes to check file signature
-            audio_file.seek(0)
-            header = audio_file.read(16)
-            audio_file.seek(0)  # Reset file pointer
-            
-            # Define audio file signatures
-            audio_signatures = {
-                b'ID3': 'MP3',
-                b'RIFF': 'WAV/AVI',
-                b'fLaC': 'FLAC',
-                b'OggS': 'OGG',
-                b'\x00\x00\x00\x20ftypM4A': 'M4A',
-                b'\x00\x00\x00\x18ftypmp42': 'MP4',
-                b'\xff\xfb': 'MP3 (no ID3)',
-                b'\xff\xf3': 'MP3 (no ID3)',
-                b'\xff\xf2': 'MP3 (no ID3)',
-            }
+            header = _read_header(audio_file)
             
             # Check if file starts with any known audio signature
-            for signature, format_name in audio_signatures.items():
-                if header.startswith(signature):
-                    return  # Valid audio file
-            
-            # Special case for WAV files
-            if header.startswith(b'RIFF') and b'WAVE' in header:
-                return  # Valid WAV file
+            if (header[:4] in _AUDIO_SIGNATURES_4
+                    or header[:3] in _AUDIO_SIGNATURES_3
+                    or header[:2] in _AUDIO_SIGNATURES_2
+                    or header.startswith(_AUDIO_SIGNATURES_LONG)):
+                return  # Valid audio file
             
             # If no signature matches, reject the file
             raise ValidationError(
@@ -190,22 +220,21 @@ class SpeakerLabelForm(forms.Form):
             raise ValidationError("Speaker name must be at least 2 characters long.")
         
         # Sanitize and validate characters
-        if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', label):
+        if not _FILENAME_RE.match(label):
             raise ValidationError(
                 "Speaker name can only contain letters, numbers, spaces, "
                 "hyphens, underscores, and dots."
             )
         
         # Check for inappropriate content (basic filter)
-        inappropriate_words = ['admin', 'root', 'system', 'null', 'undefined']
-        if label.lower() in inappropriate_words:
+        if label.casefold() in _BANNED_LABELS:
             raise ValidationError("This speaker name is not allowed.")
         
         # Escape HTML to prevent XSS
         label = escape(label)
         
         # Remove multiple consecutive spaces
-        label = re.sub(r'\s+', ' ', label).strip()
+        label = _WHITESPACE_RE.sub(' ', label).strip()
         
         return label
     
@@ -261,7 +290,7 @@ class JobSearchForm(forms.Form):
         
         if filename:
             # Remove potentially dangerous characters for search
-            filename = re.sub(r'[^\w\s\-_\.]', '', filename)
+            filename = _SEARCH_STRIP_RE.sub('', filename)
             filename = filename[:255]  # Limit length
         
         return filename
@@ -290,26 +319,19 @@ class BulkDeleteForm(forms.Form):
         if not job_ids_str:
             raise ValidationError("No jobs selected for deletion.")
         
-        try:
-            job_ids = [uuid.strip() for uuid in job_ids_str.split(',')]
-            
-            # Validate each UUID
-            from uuid import UUID
-            validated_ids = []
-            for job_id in job_ids:
-                try:
-                    UUID(job_id)  # This will raise ValueError if invalid
-                    validated_ids.append(job_id)
-                except ValueError:
-                    raise ValidationError(f"Invalid job ID format: {job_id}")
-            
-            # Limit number of jobs that can be deleted at once
-            if len(validated_ids) > 50:
-                raise ValidationError("Cannot delete more than 50 jobs at once.")
-            
-            return validated_ids
-            
-        except Exception as e:
-            if isinstance(e, ValidationError):
-                raise
-            raise ValidationError("Invalid job IDs format.")
+        parts = job_ids_str.split(',')
+        
+        # Limit number of jobs that can be deleted at once
+        if len(parts) > 50:
+            raise ValidationError("Cannot delete more than 50 jobs at once.")
+        
+        # Parse each ID once; callers get UUID objects ready for job_id__in lookups
+        validated_ids = []
+        for part in parts:
+            job_id = part.strip()
+            try:
+                validated_ids.append(UUID(job_id))
+            except ValueError:
+                raise ValidationError(f"Invalid job ID format: {job_id}")
+        
+        return validated_ids
@@ -0,0 +1,33 @@
+"""
+Queue-backed file logging so request and job threads never block on log writes.
+
+The LOGGING 'file' handler is a QueueHandler that formats records and puts them
+on log_queue; a single listener thread owns the FileHandler and does the writes.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+from pathlib import Path
+
+
+log_queue = queue.Queue(maxsize=10000)
+
+_listener = None
+
+
+def start_file_listener(filename):
+    """Start the background thread that drains log_queue into filename"""
+    global _listener
+    if _listener is not None:
+        return
+    
+    Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    
+    # Records arrive already formatted by the QueueHandler, and delay=True
+    # defers open() to the first write on the listener thread
+    file_handler = logging.FileHandler(filename, delay=True)
+    
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
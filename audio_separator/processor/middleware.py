@@ -2,6 +2,7 @@
 Security middleware for rate limiting and additional protections
 """
 
+import re
 import time
 import hashlib
 from django.http import JsonResponse
@@ -11,6 +12,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Basic CSP for audio application
+_CSP_HEADER = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "font-src 'self' https://cdn.jsdelivr.net; "
+    "media-src 'self'; "
+    "object-src 'none'; "
+    "base-uri 'self';"
+)
+
 class RateLimitMiddleware:
     """Simple rate limiting middleware"""
     
@@ -22,8 +34,17 @@ class RateLimitMiddleware:
             '/api/status/': 60,  # 60 status checks per minute
             '/api/update-speaker/': 20,  # 20 speaker updates per minute
         }
+        self._api_prefix = '/api/'
+        # One anchored alternation instead of a startswith() loop per request
+        self._rate_re = re.compile(
+            '^(' + '|'.join(re.escape(endpoint) for endpoint in self.rate_limits) + ')'
+        )
     
     def __call__(self, request):
+        # Only API endpoints are rate limited; pages and assets pass straight through
+        if not request.path.startswith(self._api_prefix):
+            return self.get_response(request)
+        
         # Check rate limits before processing request
         if self.is_rate_limited(request):
             logger.warning(f"Rate limit exceeded for {request.META.get('REMOTE_ADDR')} on {request.path}")
@@ -39,50 +60,56 @@ class RateLimitMiddleware:
         """Check if request should be rate limited"""
         
         # Skip rate limiting for non-API endpoints
-        if not request.path.startswith('/api/'):
+        if not request.path.startswith(self._api_prefix):
             return False
         
-        # Get client identifier (IP + User Agent hash for some uniqueness)
-        client_ip = self.get_client_ip(request)
-        user_agent = request.META.get('HTTP_USER_AGENT', '')
-        client_id = hashlib.md5(f"{client_ip}:{user_agent}".encode()).hexdigest()
-        
         # Get rate limit for this endpoint
-        rate_limit = None
-        for endpoint, limit in self.rate_limits.items():
-            if request.path.startswith(endpoint):
-                rate_limit = limit
-                break
-        
-        if not rate_limit:
+        match = self._rate_re.match(request.path)
+        if not match:
             return False
-        
-        # Check rate limit using cache
-        cache_key = f"rate_limit:{client_id}:{request.path}"
-        current_time = int(time.time())
-        window_start = current_time - 60  # 1-minute window
-        
-        # Get request timestamps for this client
-        requests = cache.get(cache_key, [])
-        
-        # Remove old requests outside the window
-        requests = [req_time for req_time in requests if req_time > window_start]
-        
-        # Check if rate limit exceeded
-        if len(requests) >= rate_limit:
-            return True
-        
-        # Add current request
-        requests.append(current_time)
-        cache.set(cache_key, requests, 60)  # Cache for 1 minute
-        
-        return False
+        rate_limit = self.rate_limits[match.group(1)]
+        
+        client_id = self.get_client_id(request)
+        
+        # Sliding window counter: weight the previous minute's count by how much
+        # of it still overlaps the last 60 seconds
+        now = int(time.time())
+        bucket = now // 60
+        key_prefix = f"rate_limit:{client_id}:{request.path}"
+        current_key = f"{key_prefix}:{bucket}"
+        previous_key = f"{key_prefix}:{bucket - 1}"
+        
+        # Buckets live for two minutes so the next minute can still read this one
+        cache.add(current_key, 0, 120)
+        try:
+            current_count = cache.incr(current_key)
+        except ValueError:
+            # Bucket expired between add() and incr()
+            cache.set(current_key, 1, 120)
+            current_count = 1
+        previous_count = cache.get(previous_key, 0)
+        
+        weight = (60 - (now % 60)) / 60.0
+        estimated = (previous_count or 0) * weight + (current_count or 0)
+        
+        return estimated > rate_limit
+    
+    def get_client_id(self, request):
+        """Get client identifier (IP + User Agent hash for some uniqueness)"""
+        client_id = getattr(request, '_rl_client_id', None)
+        if client_id is None:
+            client_ip = self.get_client_ip(request)
+            user_agent = request.META.get('HTTP_USER_AGENT', '')
+            # Only a bucket key, so a fast 8-byte digest is plenty
+            client_id = hashlib.blake2b(f"{client_ip}:{user_agent}".encode(), digest_size=8).hexdigest()
+            request._rl_client_id = client_id
+        return client_id
     
     def get_client_ip(self, request):
         """Get client IP address handling proxy headers"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+            ip = x_forwarded_for.partition(',')[0].strip()
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
@@ -92,30 +119,27 @@ class SecurityHeadersMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self._debug = settings.DEBUG
+        
+        # Headers that never change between responses
+        self._static_headers = {
+            'X-Content-Type-Options': 'nosniff',
+            'X-Frame-Options': 'DENY',
+            'X-XSS-Protection': '1; mode=block',
+            'Referrer-Policy': 'strict-origin-when-cross-origin',
+            'Content-Security-Policy': _CSP_HEADER,
+        }
     
     def __call__(self, request):
         response = self.get_response(request)
         
         # Add security headers
-        if not settings.DEBUG:
+        if not self._debug:
             response['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains; preload'
         
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['X-XSS-Protection'] = '1; mode=block'
-        response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Basic CSP for audio application
-        csp = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-            "font-src 'self' https://cdn.jsdelivr.net; "
-            "media-src 'self'; "
-            "object-src 'none'; "
-            "base-uri 'self';"
-        )
-        response['Content-Security-Policy'] = csp
+        # ResponseHeaders has no update(), so set them one by one
+        for name, value in self._static_headers.items():
+            response[name] = value
         
         return response
 
@@ -144,10 +168,22 @@ class FileUploadSecurityMiddleware:
         client_ip = request.META.get('REMOTE_ADDR', 'unknown')
         cache_key = f"upload_count:{client_ip}"
         
-        current_count = cache.get(cache_key, 0)
-        if current_count >= self.max_uploads_per_hour:
+        # Atomic counter so concurrent uploads can't both read the same count
+        cache.add(cache_key, 0, 3600)  # 1 hour expiry
+        try:
+            count = cache.incr(cache_key)
+        except ValueError:
+            # Counter expired between add() and incr()
+            cache.set(cache_key, 1, 3600)
+            count = 1
+        
+        if (count or 0) > self.max_uploads_per_hour:
+            # Rejected uploads don't count against the next window
+            try:
+                cache.decr(cache_key)
+            except ValueError:
+                # Counter expired or was evicted since incr(); nothing left to undo
+                pass
             return False
         
-        # Increment counter
-        cache.set(cache_key, current_count + 1, 3600)  # 1 hour expiry
         return True
\ No newline at end of file
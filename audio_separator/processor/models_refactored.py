@@ -1,31 +1,46 @@
 import uuid
 import os
+import re
+from functools import lru_cache
 from django.db import models
+from django.db.models import Avg, Count, ExpressionWrapper, F, Q, Sum
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.conf import settings
 
 
+_SPEAKER_ID_RE = re.compile(r'^SPEAKER_\d{2}$')
+_SPEAKER_LABEL_RE = re.compile(r'^[a-zA-Z0-9\s\-_\.]+$')
+
+# Single characters never allowed in filenames ('..' is checked separately)
+_FORBIDDEN_FILENAME_CHARS = frozenset('/\\:*?"<>|\x00')
+
+
+@lru_cache(maxsize=1)
+def _get_allowed_real_paths():
+    """Resolve the allowed storage directories once; settings don't change at runtime"""
+    return (
+        os.path.realpath(settings.AUDIO_UPLOAD_PATH),
+        os.path.realpath(settings.AUDIO_OUTPUT_PATH),
+        os.path.realpath(settings.MEDIA_ROOT),
+    )
+
+
 def validate_audio_file_path(value):
     """Validate that file path is within allowed directories"""
     if not value:
         return
     
+    # Check for path traversal attempts first; these need no filesystem access
+    if '..' in value or value.startswith('/'):
+        raise ValidationError("Invalid file path detected.")
+    
     try:
         real_path = os.path.realpath(value)
-        allowed_paths = [
-            os.path.realpath(settings.AUDIO_UPLOAD_PATH),
-            os.path.realpath(settings.AUDIO_OUTPUT_PATH),
-            os.path.realpath(settings.MEDIA_ROOT)
-        ]
         
-        if not any(real_path.startswith(allowed) for allowed in allowed_paths):
+        if not real_path.startswith(_get_allowed_real_paths()):
             raise ValidationError("File path is not within allowed directories.")
-        
-        # Additional security: check for path traversal attempts
-        if '..' in value or value.startswith('/'):
-            raise ValidationError("Invalid file path detected.")
             
     except Exception:
         raise ValidationError("Invalid file path.")
@@ -37,8 +52,7 @@ def validate_filename(value):
         return
     
     # Check for dangerous characters
-    dangerous_chars = ['..', '/', '\\', ':', '*', '?', '"', '<', '>', '|', '\x00']
-    if any(char in value for char in dangerous_chars):
+    if '..' in value or not _FORBIDDEN_FILENAME_CHARS.isdisjoint(value):
         raise ValidationError("Filename contains invalid characters.")
     
     # Check length
@@ -178,6 +192,12 @@ class ProcessingJob(models.Model):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['job_id']),
             models.Index(fields=['-created_at']),
+            # Partial index covering only the small set of in-flight jobs
+            models.Index(
+                fields=['status', 'created_at'],
+                name='active_jobs_idx',
+                condition=Q(status__in=['pending', 'processing']),
+            ),
         ]
         
         # Add constraints for data integrity
@@ -195,20 +215,37 @@ class ProcessingJob(models.Model):
     def __str__(self):
         return f"Job {self.job_id} - {self.original_filename} ({self.status})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status so clean() can validate transitions without a query"""
+        instance = super().from_db(db, field_names, values)
+        instance._original_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Save and treat the saved status as the new baseline for transitions"""
+        super().save(*args, **kwargs)
+        self._original_status = self.status
+    
     def clean(self):
         """Model-level validation"""
         super().clean()
         
         # Validate status transitions
         if self.pk:  # Only for existing objects
-            try:
-                old_instance = ProcessingJob.objects.get(pk=self.pk)
-                if not self._is_valid_status_transition(old_instance.status, self.status):
-                    raise ValidationError(
-                        f"Invalid status transition from {old_instance.status} to {self.status}"
-                    )
-            except ProcessingJob.DoesNotExist:
-                pass
+            old_status = getattr(self, '_original_status', None)
+            if old_status is None:
+                # Instance wasn't loaded from the database; fall back to a lookup
+                old_status = (
+                    ProcessingJob.objects.filter(pk=self.pk)
+                    .values_list('status', flat=True)
+                    .first()
+                )
+            
+            if old_status is not None and not self._is_valid_status_transition(old_status, self.status):
+                raise ValidationError(
+                    f"Invalid status transition from {old_status} to {self.status}"
+                )
         
         # Validate file path security
         if self.uploaded_file_path:
@@ -260,25 +297,39 @@ class ProcessingJob(models.Model):
         else:
             return reverse('processor:status', kwargs={'job_id': self.job_id})
     
-    def mark_as_failed(self, error_message):
+    def _apply_update(self, send_signals, **fields):
+        """Set fields locally and persist them, with a plain UPDATE unless signals are needed"""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        
+        if send_signals:
+            self.save(update_fields=list(fields))
+        else:
+            ProcessingJob.objects.filter(pk=self.pk).update(**fields)
+            self._original_status = self.status
+    
+    def mark_as_failed(self, error_message, send_signals=False):
         """Mark job as failed with error message"""
-        self.status = 'failed'
-        self.error_message = error_message[:1000]  # Truncate long messages
-        self.completed_at = timezone.now()
-        self.save(update_fields=['status', 'error_message', 'completed_at'])
+        self._apply_update(
+            send_signals,
+            status='failed',
+            error_message=error_message[:1000],  # Truncate long messages
+            completed_at=timezone.now(),
+        )
     
-    def mark_as_completed(self):
+    def mark_as_completed(self, send_signals=False):
         """Mark job as completed"""
-        self.status = 'completed'
-        self.progress_percentage = 100
-        self.completed_at = timezone.now()
-        self.save(update_fields=['status', 'progress_percentage', 'completed_at'])
+        self._apply_update(
+            send_signals,
+            status='completed',
+            progress_percentage=100,
+            completed_at=timezone.now(),
+        )
 
 
 def validate_speaker_id(value):
     """Validate speaker ID format"""
-    import re
-    if not re.match(r'^SPEAKER_\d{2}$', value):
+    if not _SPEAKER_ID_RE.match(value):
         raise ValidationError("Speaker ID must be in format SPEAKER_XX where XX are digits.")
 
 
@@ -287,8 +338,7 @@ def validate_speaker_label(value):
     if not value:
         return
     
-    import re
-    if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', value):
+    if not _SPEAKER_LABEL_RE.match(value):
         raise ValidationError(
             "Speaker label can only contain letters, numbers, spaces, "
             "hyphens, underscores, and dots."
@@ -423,14 +473,28 @@ class SpeakerTrack(models.Model):
             'speaker_id': self.speaker_id
         })
     
+    def _stat_file_size(self):
+        """Refresh file_size with a single stat; returns True if it was read"""
+        if not self.audio_file_path:
+            return False
+        try:
+            self.file_size = os.stat(self.audio_file_path).st_size
+            return True
+        except OSError:
+            return False  # File might be temporarily unavailable
+    
     def update_file_size(self):
         """Update file size from actual file"""
-        if self.audio_file_path and os.path.exists(self.audio_file_path):
-            try:
-                self.file_size = os.path.getsize(self.audio_file_path)
-                self.save(update_fields=['file_size'])
-            except OSError:
-                pass  # File might be temporarily unavailable
+        if self._stat_file_size():
+            self.save(update_fields=['file_size'])
+    
+    @classmethod
+    def update_file_sizes(cls, tracks):
+        """Update file sizes for many tracks with one stat each and a single bulk UPDATE"""
+        updated = [track for track in tracks if track._stat_file_size()]
+        if updated:
+            cls.objects.bulk_update(updated, ['file_size'])
+        return len(updated)
 
 
 class ProcessingStats(models.Model):
@@ -497,38 +561,31 @@ class ProcessingStats(models.Model):
         # Get or create stats object
         stats, created = cls.objects.get_or_create(date=date)
         
-        # Calculate statistics for the date
-        jobs_on_date = ProcessingJob.objects.filter(created_at__date=date)
-        
-        stats.jobs_created = jobs_on_date.count()
-        stats.jobs_completed = jobs_on_date.filter(status='completed').count()
-        stats.jobs_failed = jobs_on_date.filter(status='failed').count()
-        
-        # Calculate total processing time
-        completed_jobs = jobs_on_date.filter(
-            status='completed',
-            started_at__isnull=False,
-            completed_at__isnull=False
+        # Calculate statistics for the date in a single aggregate query
+        timed_completed = Q(status='completed', started_at__isnull=False, completed_at__isnull=False)
+        agg = ProcessingJob.objects.filter(created_at__date=date).aggregate(
+            created=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            failed=Count('id', filter=Q(status='failed')),
+            timed_completed=Count('id', filter=timed_completed),
+            total_size=Sum('file_size'),
+            avg_speakers=Avg('speaker_count', filter=timed_completed),
+            total_time=Sum(
+                ExpressionWrapper(F('completed_at') - F('started_at'), output_field=models.DurationField()),
+                filter=timed_completed,
+            ),
         )
         
-        if completed_jobs.exists():
-            from django.db.models import Sum, Avg
-            total_time = sum(
-                (job.completed_at - job.started_at).total_seconds()
-                for job in completed_jobs
-            )
-            stats.total_processing_time = timezone.timedelta(seconds=total_time)
-            
-            # Calculate average speakers per job
-            avg_speakers = completed_jobs.aggregate(
-                avg=Avg('speaker_count')
-            )['avg']
-            stats.average_speakers_per_job = avg_speakers
+        stats.jobs_created = agg['created']
+        stats.jobs_completed = agg['completed']
+        stats.jobs_failed = agg['failed']
+        
+        # Processing time and speaker average only cover jobs with both timestamps
+        if agg['timed_completed']:
+            stats.total_processing_time = agg['total_time']
+            stats.average_speakers_per_job = agg['avg_speakers']
         
-        # Calculate total file size
-        stats.total_file_size = jobs_on_date.aggregate(
-            total=Sum('file_size')
-        )['total'] or 0
+        stats.total_file_size = agg['total_size'] or 0
         
         stats.save()
         return stats
@@ -1,13 +1,27 @@
 import os
+import re
+import json
+import time
 import uuid
+import wave
+import shutil
+import traceback
+import heapq
+import queue
 import logging
 import threading
 import subprocess
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+import numpy as np
+import soundfile as sf
 from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
 from django.utils import timezone
-from pydub import AudioSegment
 from .models import ProcessingJob, SpeakerTrack
 
 # Set up logging
@@ -24,14 +38,337 @@ if not logger.handlers:
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-# Global dictionary to track job statuses
-job_statuses = {}
+# Characters stripped from uploaded file extensions
+_EXT_SANITIZE_RE = re.compile(r'[^\w.-]')
 
-# Global dictionary to track cancellation requests
-job_cancellations = {}
+# Absolute ffmpeg/ffprobe paths, resolved once per process
+_FFMPEG_PATH = shutil.which("ffmpeg")
+_FFPROBE_PATH = shutil.which("ffprobe")
+logger.info(f"FFmpeg path: {_FFMPEG_PATH}, FFprobe path: {_FFPROBE_PATH}")
 
-# Global dictionary to track running threads
-job_threads = {}
+# Seconds to wait for ffmpeg output before re-checking for cancellation
+FFMPEG_POLL_INTERVAL = 0.5
+
+
+def _pump_stream(stream, chunks: queue.SimpleQueue):
+    """Copy a pipe into a queue until EOF, which is marked with b''.
+    
+    A thread and a timed queue get work for pipes on every platform; selectors on
+    Windows only accept sockets.
+    """
+    try:
+        for chunk in iter(lambda: stream.read1(65536), b''):
+            chunks.put(chunk)
+    except (OSError, ValueError):
+        # The caller closed the pipe after killing the process
+        pass
+    finally:
+        chunks.put(b'')
+
+# Keys ffmpeg writes on its -progress stream; anything else on stderr is an error message
+_FFMPEG_PROGRESS_KEYS = frozenset({
+    'frame', 'fps', 'stream_0_0_q', 'bitrate', 'total_size', 'out_time_us', 'out_time_ms',
+    'out_time', 'dup_frames', 'drop_frames', 'speed', 'progress',
+})
+
+# Loaded WhisperX models shared across jobs, keyed by model parameters
+_MODEL_CACHE = {}
+_model_lock = threading.Lock()
+
+
+
+class DaemonThreadPool:
+    """Bounded pool of daemon worker threads handing out concurrent.futures.Future objects.
+    
+    ThreadPoolExecutor joins its (non-daemon) workers at interpreter exit, so a running
+    WhisperX or ffmpeg job would hold up sys.exit(), autoreload and worker restarts past
+    the shutdown timeout in apps.py. These workers die with the process instead.
+    """
+    
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._work_queue = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+    
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        self._work_queue.put((future, fn, args, kwargs))
+        
+        # Workers start lazily, one per submission until the pool is full
+        with self._lock:
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._worker, daemon=True,
+                    name=f"{self._thread_name_prefix}_{len(self._threads)}"
+                )
+                thread.start()
+                self._threads.append(thread)
+        return future
+    
+    def _worker(self):
+        while True:
+            future, fn, args, kwargs = self._work_queue.get()
+            # Skip work cancelled while it was queued
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                del future, fn, args, kwargs
+
+
+# Pool running the separation pipelines, sized to what the GPU/CPU can run concurrently
+_job_pool = DaemonThreadPool(max_workers=settings.MAX_CONCURRENT_JOBS, thread_name_prefix='audio-job')
+
+# Pool for alignment/diarization calls so they can be bounded by a timeout from any thread;
+# a timed-out call keeps its worker until it returns, hence the headroom
+_aux_pool = DaemonThreadPool(max_workers=settings.MAX_CONCURRENT_JOBS * 2, thread_name_prefix='whisperx-aux')
+
+# Sample rate WhisperX works at
+WHISPERX_SAMPLE_RATE = 16000
+
+# Same-speaker segments closer than this many seconds are joined into one span
+SEGMENT_MERGE_GAP = 0.2
+
+# Approximate device memory needed per transcription batch item
+BATCH_VRAM_BYTES = 400 * 1024 * 1024
+
+# Transcript returned by the mock WhisperX fallback
+_MOCK_SEGMENTS = (
+    {"start": 0.0, "end": 3.0, "text": "Hello, welcome to our podcast.", "speaker": "SPEAKER_00"},
+    {"start": 3.5, "end": 7.0, "text": "Thank you for having me.", "speaker": "SPEAKER_01"},
+    {"start": 7.5, "end": 11.0, "text": "Let's talk about the topic.", "speaker": "SPEAKER_00"},
+    {"start": 11.5, "end": 15.0, "text": "That sounds interesting.", "speaker": "SPEAKER_01"},
+    {"start": 15.5, "end": 19.0, "text": "I think we should discuss this further.", "speaker": "SPEAKER_00"},
+    {"start": 19.5, "end": 23.0, "text": "Absolutely, I agree with that point.", "speaker": "SPEAKER_01"},
+)
+_MOCK_SPEAKER_COUNTS = {"SPEAKER_00": 3, "SPEAKER_01": 3}
+
+# Timeouts in seconds for the alignment and diarization steps
+ALIGNMENT_TIMEOUT = 300
+DIARIZATION_TIMEOUT = 600
+
+# Release cached CUDA blocks only every N transcriptions instead of after each job
+CUDA_EMPTY_CACHE_INTERVAL = 10
+_cuda_jobs_since_empty = 0
+
+
+def _get_cached_model(key: tuple, loader):
+    """Return a cached model, loading it on first use"""
+    with _model_lock:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = _MODEL_CACHE[key] = loader()
+        return model
+
+
+def _should_empty_cuda_cache() -> bool:
+    """Count a finished CUDA transcription and report whether to release cached blocks"""
+    global _cuda_jobs_since_empty
+    with _model_lock:
+        _cuda_jobs_since_empty += 1
+        if _cuda_jobs_since_empty < CUDA_EMPTY_CACHE_INTERVAL:
+            return False
+        _cuda_jobs_since_empty = 0
+        return True
+
+
+def _compute_type_for(device: str) -> str:
+    """Configured compute type, downgraded to INT8 when FP16 isn't usable on CPU"""
+    compute_type = settings.WHISPERX_COMPUTE_TYPE
+    if device == "cpu" and "float16" in compute_type:
+        return "int8"
+    return compute_type
+
+
+# Seconds between batched database writes of in-progress job statuses
+STATUS_FLUSH_INTERVAL = 0.5
+
+# Buffer size for copying uploads to disk
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def _drop_page_cache(fd: int):
+    """Advise the kernel to evict a file's pages where posix_fadvise is available.
+    
+    Dirty pages are not evicted, so this is only for files that are read back, not
+    ones just written; the upload is released after ffmpeg has read it.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError as e:
+            logger.debug(f"posix_fadvise failed: {e}")
+
+
+@lru_cache(maxsize=8)
+def _silence_bytes(frames: int, channels: int) -> bytes:
+    """Zeroed 16-bit PCM frames, shared by every track with the same layout"""
+    return bytes(frames * channels * 2)
+
+
+class _ProgressReader:
+    """File wrapper that logs copy progress at most once per second"""
+    
+    def __init__(self, fileobj, total_size: int):
+        self._fileobj = fileobj
+        self._total_size = total_size
+        self._read_size = 0
+        self._last_log = time.monotonic()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._read_size += len(data)
+        now = time.monotonic()
+        if now - self._last_log >= 1.0 or not data:
+            self._last_log = now
+            progress = self._read_size / self._total_size * 100
+            logger.info(f"Upload progress: {progress:.1f}% ({self._read_size}/{self._total_size} bytes)")
+        return data
+
+
+
+class JobRegistry:
+    """Thread-safe per-job state (status, cancellation flag, pool future) sharded by job ID"""
+    
+    def __init__(self, shard_count: int = 16):
+        self._shards = [(threading.Lock(), {}) for _ in range(shard_count)]
+    
+    def _shard(self, job_id: str):
+        return self._shards[hash(job_id) % len(self._shards)]
+    
+    def get(self, job_id: str, field: str, default=None):
+        """Return one field of a job's entry"""
+        lock, entries = self._shard(job_id)
+        with lock:
+            entry = entries.get(job_id)
+            return entry.get(field, default) if entry else default
+    
+    def set(self, job_id: str, field: str, value):
+        """Set one field of a job's entry, creating the entry if needed"""
+        lock, entries = self._shard(job_id)
+        with lock:
+            entries.setdefault(job_id, {})[field] = value
+    
+    def clear(self, job_id: str, *fields: str):
+        """Remove fields from a job's entry, dropping the entry once it is empty"""
+        lock, entries = self._shard(job_id)
+        with lock:
+            entry = entries.get(job_id)
+            if entry is None:
+                return
+            for field in fields:
+                entry.pop(field, None)
+            if not entry:
+                del entries[job_id]
+    
+    def items(self, field: str) -> List:
+        """Snapshot of (job_id, value) pairs for every job that has the field set"""
+        snapshot = []
+        for lock, entries in self._shards:
+            with lock:
+                snapshot.extend((job_id, entry[field]) for job_id, entry in entries.items()
+                                if field in entry)
+        return snapshot
+    
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        return self.get(job_id, 'status')
+    
+    def set_status(self, job_id: str, status: Dict):
+        self.set(job_id, 'status', status)
+    
+    def owns(self, job_id: str) -> bool:
+        """Whether this process created or is running the job, and so keeps its status current"""
+        lock, entries = self._shard(job_id)
+        with lock:
+            entry = entries.get(job_id)
+            return bool(entry) and ('future' in entry or 'pk' in entry)
+    
+    def is_cancelled(self, job_id: str) -> bool:
+        return self.get(job_id, 'cancelled', False)
+    
+    def cancel(self, job_id: str):
+        """Flag a job as cancelled and forget its status and future"""
+        lock, entries = self._shard(job_id)
+        with lock:
+            entry = entries.setdefault(job_id, {})
+            entry['cancelled'] = True
+            entry.pop('status', None)
+            entry.pop('future', None)
+
+
+# Global registry of in-memory job state
+job_registry = JobRegistry()
+
+# Job IDs whose in-memory status still has to be written to the database
+_dirty_jobs = queue.Queue()
+
+# Serializes batched flushes with the immediate writes of terminal states
+_flush_lock = threading.Lock()
+
+_flusher_lock = threading.Lock()
+_flusher_started = False
+
+
+def _queue_status_flush(job_id: str):
+    """Mark a job's status dirty, starting the flusher thread on first use"""
+    global _flusher_started
+    if not _flusher_started:
+        with _flusher_lock:
+            if not _flusher_started:
+                threading.Thread(target=_status_flusher, name='status-flusher', daemon=True).start()
+                _flusher_started = True
+    _dirty_jobs.put(job_id)
+
+
+def _flush_dirty_statuses():
+    """Write the latest in-memory status of every dirty job with one bulk_update"""
+    dirty = set()
+    while True:
+        try:
+            dirty.add(str(_dirty_jobs.get_nowait()))
+        except queue.Empty:
+            break
+    if not dirty:
+        return
+    
+    with _flush_lock:
+        now = timezone.now()
+        updated = []
+        for job in ProcessingJob.objects.filter(job_id__in=dirty):
+            status = job_registry.get_status(str(job.job_id))
+            # Cancelled jobs have no status left and terminal states were already written
+            if status is None or status['status'] in ('completed', 'failed'):
+                continue
+            job.status = status['status']
+            job.current_step = status['step']
+            job.progress_percentage = status['progress']
+            if job.status == 'processing' and job.started_at is None:
+                job.started_at = now
+            updated.append(job)
+        
+        if updated:
+            ProcessingJob.objects.bulk_update(
+                updated, ['status', 'current_step', 'progress_percentage', 'started_at']
+            )
+
+
+def _status_flusher():
+    """Background loop flushing dirty job statuses every STATUS_FLUSH_INTERVAL seconds"""
+    while True:
+        time.sleep(STATUS_FLUSH_INTERVAL)
+        try:
+            _flush_dirty_statuses()
+        except Exception as e:
+            logger.error(f"Error flushing job statuses: {str(e)}")
+        finally:
+            close_old_connections()
 
 class AudioProcessingService:
     """Service class for handling audio separation pipeline"""
@@ -46,7 +383,6 @@ class AudioProcessingService:
             logger.info(f"Starting file upload for job {job_id}, file: {uploaded_file.name}, size: {uploaded_file.size} bytes")
             
             # Validate job_id is a proper UUID to prevent path traversal
-            import uuid
             try:
                 uuid.UUID(job_id)
             except ValueError:
@@ -58,35 +394,28 @@ class AudioProcessingService:
             logger.info(f"Upload directory ready: {upload_dir}")
             
             # Sanitize filename and generate secure path
-            import re
-            safe_extension = re.sub(r'[^\w.-]', '', os.path.splitext(uploaded_file.name)[1].lower())
+            safe_extension = _EXT_SANITIZE_RE.sub('', os.path.splitext(uploaded_file.name)[1].lower())
             if not safe_extension or safe_extension not in settings.ALLOWED_AUDIO_FORMATS:
                 raise ValueError(f"Invalid or unsafe file extension: {safe_extension}")
             
             filename = f"{job_id}{safe_extension}"
             file_path = upload_dir / filename
             
-            # Ensure the final path is within the upload directory (prevent path traversal)
-            try:
-                file_path.resolve().relative_to(upload_dir.resolve())
-            except ValueError:
+            # Ensure the final path is within the upload directory (prevent path traversal);
+            # a pure string check, the filename is already built from a UUID and a whitelisted extension
+            upload_root = os.path.normpath(str(upload_dir))
+            if os.path.commonpath([os.path.normpath(str(file_path)), upload_root]) != upload_root:
                 raise ValueError("Invalid file path - potential path traversal attempt")
             
             logger.info(f"Target file path: {file_path}")
             
             # Save file with progress tracking
             total_size = uploaded_file.size
-            written_size = 0
+            source = _ProgressReader(uploaded_file, total_size) if total_size else uploaded_file
             
+            uploaded_file.seek(0)
             with open(file_path, 'wb+') as destination:
-                for chunk_num, chunk in enumerate(uploaded_file.chunks()):
-                    destination.write(chunk)
-                    written_size += len(chunk)
-                    
-                    # Log progress every 10 chunks or at completion
-                    if chunk_num % 10 == 0 or written_size >= total_size:
-                        progress = (written_size / total_size * 100) if total_size > 0 else 100
-                        logger.info(f"Upload progress: {progress:.1f}% ({written_size}/{total_size} bytes)")
+                shutil.copyfileobj(source, destination, length=_COPY_BUFFER_SIZE)
             
             # Verify file was saved correctly
             if not file_path.exists() or file_path.stat().st_size != total_size:
@@ -115,13 +444,14 @@ class AudioProcessingService:
                 status='pending'
             )
             
-            # Initialize job status
-            job_statuses[job_id] = {
+            # Initialize job status; the cached PK lets status updates skip the job_id lookup
+            job_registry.set(job_id, 'pk', job.pk)
+            job_registry.set_status(job_id, {
                 'status': 'pending',
                 'step': 'uploaded',
                 'progress': 0,
                 'message': 'File uploaded successfully'
-            }
+            })
             
             logger.info(f"Created processing job: {job_id}")
             return job
@@ -132,7 +462,7 @@ class AudioProcessingService:
     
     def check_job_cancelled(self, job_id: str) -> bool:
         """Check if job has been cancelled"""
-        return job_cancellations.get(job_id, False)
+        return job_registry.is_cancelled(job_id)
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job"""
@@ -140,17 +470,16 @@ class AudioProcessingService:
             logger.info(f"Cancelling job {job_id}")
             
             # Mark job as cancelled
-            job_cancellations[job_id] = True
+            job_registry.set(job_id, 'cancelled', True)
+            future = job_registry.get(job_id, 'future')
             
             # Update job status
             self.update_job_status(job_id, 'failed', 'cancelled', 0, "Job cancelled by user")
             
-            # Clean up resources
-            if job_id in job_statuses:
-                del job_statuses[job_id]
-            
-            if job_id in job_threads:
-                del job_threads[job_id]
+            # Clean up resources and drop the job from the queue if it hasn't started yet
+            job_registry.cancel(job_id)
+            if future is not None:
+                future.cancel()
             
             logger.info(f"Job {job_id} cancelled successfully")
             return True
@@ -168,46 +497,101 @@ class AudioProcessingService:
                 logger.info(f"Job {job_id} is cancelled, skipping status update")
                 return
                 
-            logger.info(f"UPDATING JOB STATUS: {job_id} -> {status}, {step}, {progress}%, '{message}'")
-            
             # Update in-memory status
-            job_statuses[job_id] = {
+            job_registry.set_status(job_id, {
                 'status': status,
                 'step': step,
                 'progress': progress,
                 'message': message
-            }
-            logger.info(f"Updated in-memory status for {job_id}: {job_statuses[job_id]}")
+            })
+            logger.info("job=%s status=%s step=%s progress=%d msg=%s", job_id, status, step, progress, message)
             
-            # Update database
-            job = ProcessingJob.objects.get(job_id=job_id)
-            job.status = status
-            job.current_step = step
-            job.progress_percentage = progress
+            # Progress updates are written in batches by the status flusher
+            if status not in ['completed', 'failed']:
+                _queue_status_flush(job_id)
+                return
+            
+            # Terminal states are written immediately with a single UPDATE
+            fields = {
+                'status': status,
+                'current_step': step,
+                'progress_percentage': progress,
+                'completed_at': timezone.now()
+            }
             
             # Set error message for cancelled jobs
             if status == 'failed' and step == 'cancelled':
-                job.error_message = "Job cancelled by user"
-            
-            if status == 'processing' and not job.started_at:
-                job.started_at = timezone.now()
-                logger.info(f"Set started_at for job {job_id}")
-            elif status in ['completed', 'failed']:
-                job.completed_at = timezone.now()
-                logger.info(f"Set completed_at for job {job_id}")
-            
-            job.save()
-            logger.info(f"Database updated for job {job_id}")
+                fields['error_message'] = "Job cancelled by user"
             
-            logger.info(f"Job {job_id} status updated successfully: {status} - {step} ({progress}%)")
+            pk = job_registry.get(job_id, 'pk')
+            if pk is not None:
+                jobs = ProcessingJob.objects.filter(pk=pk)
+            else:
+                jobs = ProcessingJob.objects.filter(job_id=job_id)
+            with _flush_lock:
+                jobs.update(**fields)
             
         except Exception as e:
             logger.error(f"Error updating job status: {str(e)}")
-            import traceback
             logger.error(f"Update status traceback: {traceback.format_exc()}")
     
+    def warm_up(self):
+        """Import the WhisperX stack and load the transcription model ahead of the first job"""
+        try:
+            import whisperx
+            import torch
+        except ImportError as e:
+            logger.warning(f"WhisperX not available for preloading: {e}")
+            return
+        
+        try:
+            self.load_whisper_model(whisperx, self.resolve_device(torch))
+            logger.info("WhisperX preloaded")
+        except Exception as e:
+            logger.warning(f"Could not preload WhisperX model: {e}")
+    
+    def resolve_device(self, torch) -> str:
+        """Configured WhisperX device, falling back to CPU when CUDA is missing"""
+        device = settings.WHISPERX_DEVICE
+        if device == "cuda" and not torch.cuda.is_available():
+            logger.warning("CUDA not available, falling back to CPU")
+            device = "cpu"
+        return device
+    
+    def load_whisper_model(self, whisperx, device: str):
+        """Get the shared WhisperX transcription model for a device"""
+        compute_type = _compute_type_for(device)
+        return _get_cached_model(
+            ('whisper', settings.WHISPERX_MODEL, device, compute_type),
+            lambda: whisperx.load_model(settings.WHISPERX_MODEL, device=device, compute_type=compute_type)
+        )
+    
+    def probe_media(self, input_path: str) -> Dict:
+        """Read format and stream information with a single ffprobe call"""
+        if not _FFPROBE_PATH:
+            return {}
+        try:
+            result = subprocess.run(
+                [_FFPROBE_PATH, '-v', 'error', '-show_format', '-show_streams', '-of', 'json', input_path],
+                capture_output=True, text=True, timeout=60, check=True
+            )
+            return json.loads(result.stdout)
+        except (subprocess.SubprocessError, OSError, ValueError) as e:
+            logger.warning(f"Could not probe {input_path}: {e}")
+            return {}
+    
+    def is_whisperx_wav(self, probe: Dict) -> bool:
+        """Whether probed media is already 16kHz mono 16-bit PCM WAV"""
+        audio_streams = [stream for stream in probe.get('streams', []) if stream.get('codec_type') == 'audio']
+        if len(audio_streams) != 1:
+            return False
+        stream = audio_streams[0]
+        return (stream.get('codec_name') == 'pcm_s16le'
+                and stream.get('sample_rate') == '16000'
+                and stream.get('channels') == 1)
+    
     def convert_to_wav(self, input_path: str, job_id: str) -> str:
-        """Convert audio file to WAV format using pydub"""
+        """Convert audio file to 16kHz mono WAV with ffmpeg"""
         try:
             # Check if job is cancelled
             if self.check_job_cancelled(job_id):
@@ -224,54 +608,6 @@ class AudioProcessingService:
             file_size = os.path.getsize(input_path)
             logger.info(f"Input file size: {file_size} bytes")
             
-            self.update_job_status(job_id, 'processing', 'converting', 15, 
-                                 "Loading audio file...")
-            
-            # Check pydub dependencies
-            try:
-                from pydub.utils import which
-                ffmpeg_path = which("ffmpeg")
-                ffprobe_path = which("ffprobe")
-                logger.info(f"FFmpeg path: {ffmpeg_path}")
-                logger.info(f"FFprobe path: {ffprobe_path}")
-                
-                if not ffmpeg_path:
-                    logger.warning("FFmpeg not found in PATH - may cause issues with some audio formats")
-            except Exception as dep_error:
-                logger.warning(f"Could not check dependencies: {dep_error}")
-            
-            # Check if job is cancelled
-            if self.check_job_cancelled(job_id):
-                raise Exception("Job cancelled by user")
-                
-            # Load audio file
-            logger.info(f"Loading audio file: {input_path}")
-            try:
-                audio = AudioSegment.from_file(input_path)
-            except Exception as load_error:
-                logger.error(f"Failed to load audio file: {load_error}")
-                # Try with explicit format detection
-                file_extension = os.path.splitext(input_path)[1].lower()
-                logger.info(f"Trying to load with explicit format: {file_extension}")
-                if file_extension == '.mp3':
-                    audio = AudioSegment.from_mp3(input_path)
-                elif file_extension == '.wav':
-                    audio = AudioSegment.from_wav(input_path)
-                elif file_extension == '.flac':
-                    audio = AudioSegment.from_flac(input_path)
-                elif file_extension == '.m4a':
-                    audio = AudioSegment.from_file(input_path, format="m4a")
-                else:
-                    raise
-            
-            # Log audio properties
-            duration_ms = len(audio)
-            duration_sec = duration_ms / 1000
-            logger.info(f"Audio loaded - Duration: {duration_sec:.2f}s, Channels: {audio.channels}, Frame rate: {audio.frame_rate}Hz")
-            
-            self.update_job_status(job_id, 'processing', 'converting', 20, 
-                                 f"Audio loaded ({duration_sec:.1f}s). Exporting to WAV...")
-            
             # Create output path
             output_path = self.temp_dir / f"{job_id}_converted.wav"
             logger.info(f"Output path: {output_path}")
@@ -279,22 +615,114 @@ class AudioProcessingService:
             # Ensure temp directory exists
             self.temp_dir.mkdir(parents=True, exist_ok=True)
             
-            # Check if job is cancelled before export
+            probe = self.probe_media(input_path)
+            
+            # Already in WhisperX's format: link the upload instead of re-encoding it
+            if self.is_whisperx_wav(probe):
+                if output_path.exists():
+                    output_path.unlink()
+                try:
+                    os.link(input_path, output_path)
+                except OSError:
+                    shutil.copyfile(input_path, output_path)
+                logger.info(f"Input is already 16kHz mono PCM WAV, reusing it as {output_path}")
+                self.update_job_status(job_id, 'processing', 'converting', 25, 
+                                     "Audio is already in WAV format")
+                return str(output_path)
+            
+            # Check ffmpeg dependencies
+            if not _FFMPEG_PATH:
+                raise RuntimeError("FFmpeg not found in PATH - required for audio conversion")
+            
+            try:
+                duration_sec = float(probe['format']['duration'])
+            except (KeyError, TypeError, ValueError):
+                duration_sec = None
+            if duration_sec:
+                logger.info(f"Audio duration: {duration_sec:.2f}s")
+                message = f"Audio loaded ({duration_sec:.1f}s). Converting to WAV..."
+            else:
+                message = "Converting to WAV..."
+            self.update_job_status(job_id, 'processing', 'converting', 15, message)
+            
+            # Check if job is cancelled before conversion
             if self.check_job_cancelled(job_id):
                 raise Exception("Job cancelled by user")
-                
-            # Export as WAV with timeout protection
-            logger.info("Starting WAV export...")
-            import time
             
+            # Decode, downmix and resample to WhisperX's 16kHz target in one ffmpeg pass;
+            # progress key=value lines and errors share stderr
+            command = [
+                _FFMPEG_PATH, '-nostdin', '-y', '-hide_banner', '-loglevel', 'error',
+                '-i', input_path, '-ac', '1', '-ar', '16000', '-c:a', 'pcm_s16le',
+                '-progress', 'pipe:2', '-nostats', str(output_path)
+            ]
+            logger.info("Starting ffmpeg conversion...")
+            start_time = time.time()
+            
+            error_lines = []
+            last_progress = 15
+            proc = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE)
             try:
-                start_time = time.time()
-                audio.export(output_path, format="wav")
-                export_time = time.time() - start_time
-                logger.info(f"WAV export completed in {export_time:.2f} seconds")
-            except Exception as export_error:
-                logger.error(f"WAV export failed: {str(export_error)}")
-                raise
+                # Wait on stderr with a timeout so cancellation is noticed even while ffmpeg is silent
+                chunks = queue.SimpleQueue()
+                threading.Thread(target=_pump_stream, args=(proc.stderr, chunks),
+                                 name=f'ffmpeg-stderr-{job_id}', daemon=True).start()
+                pending = b''
+                while True:
+                    if self.check_job_cancelled(job_id):
+                        proc.terminate()
+                        raise Exception("Job cancelled by user")
+                    
+                    try:
+                        chunk = chunks.get(timeout=FFMPEG_POLL_INTERVAL)
+                    except queue.Empty:
+                        continue
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b'\n')
+                    
+                    for raw_line in lines:
+                        line = raw_line.decode('utf-8', 'replace').strip()
+                        key, sep, value = line.partition('=')
+                        if not sep:
+                            if key:
+                                error_lines.append(key)
+                            continue
+                        
+                        # out_time_ms is reported in microseconds
+                        if key == 'out_time_ms' and duration_sec:
+                            try:
+                                fraction = int(value) / (duration_sec * 1_000_000)
+                            except ValueError:
+                                continue
+                            progress = 15 + min(int(fraction * 10), 9)
+                            if progress > last_progress:
+                                last_progress = progress
+                                self.update_job_status(job_id, 'processing', 'converting', progress, 
+                                                     f"Converting to WAV... {min(fraction, 1.0) * 100:.0f}%")
+                        elif key not in _FFMPEG_PROGRESS_KEYS:
+                            error_lines.append(line)
+                
+                if pending.strip():
+                    error_lines.append(pending.decode('utf-8', 'replace').strip())
+                return_code = proc.wait()
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stderr.close()
+            
+            if return_code != 0:
+                details = '; '.join(error_lines[-5:]) or f"exit code {return_code}"
+                raise RuntimeError(f"FFmpeg conversion failed: {details}")
+            
+            # The upload is not read again; release its cached pages
+            with open(input_path, 'rb') as source:
+                _drop_page_cache(source.fileno())
+            
+            export_time = time.time() - start_time
+            logger.info(f"WAV conversion finished in {export_time:.2f} seconds")
             
             # Verify output file was created
             if not os.path.exists(output_path):
@@ -311,7 +739,6 @@ class AudioProcessingService:
         except Exception as e:
             logger.error(f"Error converting audio: {str(e)}")
             logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
     
@@ -343,10 +770,7 @@ class AudioProcessingService:
                 return self._run_mock_whisperx(job_id)
             
             # Check device availability
-            device = settings.WHISPERX_DEVICE
-            if device == "cuda" and not torch.cuda.is_available():
-                logger.warning("CUDA not available, falling back to CPU")
-                device = "cpu"
+            device = self.resolve_device(torch)
             
             logger.info(f"Using device: {device}")
             
@@ -355,11 +779,7 @@ class AudioProcessingService:
                                  "Loading WhisperX model...")
             logger.info(f"Loading WhisperX model: {settings.WHISPERX_MODEL}")
             
-            model = whisperx.load_model(
-                settings.WHISPERX_MODEL, 
-                device=device, 
-                compute_type=settings.WHISPERX_COMPUTE_TYPE
-            )
+            model = self.load_whisper_model(whisperx, device)
             logger.info("WhisperX model loaded successfully")
             
             # Step 2: Load audio and transcribe
@@ -370,8 +790,11 @@ class AudioProcessingService:
                                  "Transcribing audio...")
             logger.info("Starting audio transcription")
             
-            audio = whisperx.load_audio(wav_path)
-            result = model.transcribe(audio, batch_size=settings.WHISPERX_BATCH_SIZE)
+            audio = self.load_audio(whisperx, wav_path)
+            audio_duration = len(audio) / WHISPERX_SAMPLE_RATE
+            batch_size = self.pick_batch_size(torch, device, audio_duration)
+            logger.info(f"Transcribing {audio_duration:.1f}s of audio with batch size {batch_size}")
+            result = model.transcribe(audio, batch_size=batch_size)
             
             logger.info(f"Transcription completed. Found {len(result.get('segments', []))} segments")
             
@@ -384,41 +807,29 @@ class AudioProcessingService:
             logger.info("Loading alignment model")
             
             try:
-                model_a, metadata = whisperx.load_align_model(
-                    language_code=result["language"], 
-                    device=device
+                language = result["language"]
+                model_a, metadata = _get_cached_model(
+                    ('align', language, device),
+                    lambda: whisperx.load_align_model(language_code=language, device=device)
                 )
                 logger.info(f"Alignment model loaded for language: {result['language']}")
                 
-                # Add timeout and error handling for alignment
-                import signal
-                import time
-                
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("WhisperX alignment timed out")
-                
-                # Set timeout for alignment (5 minutes)
-                old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(300)  # 5 minutes timeout
-                
-                try:
-                    logger.info("Starting alignment process...")
-                    result = whisperx.align(
-                        result["segments"], 
-                        model_a, 
-                        metadata, 
-                        audio, 
-                        device, 
-                        return_char_alignments=False
-                    )
-                    logger.info("Alignment completed successfully")
-                finally:
-                    # Reset alarm
-                    signal.alarm(0)
-                    signal.signal(signal.SIGALRM, old_handler)
+                # Run alignment on the auxiliary pool so the timeout also works from worker threads
+                logger.info("Starting alignment process...")
+                future = _aux_pool.submit(
+                    whisperx.align,
+                    result["segments"], 
+                    model_a, 
+                    metadata, 
+                    audio, 
+                    device, 
+                    return_char_alignments=False
+                )
+                result = future.result(timeout=ALIGNMENT_TIMEOUT)
+                logger.info("Alignment completed successfully")
                     
-            except TimeoutError as timeout_error:
-                logger.warning(f"Alignment timed out: {timeout_error}. Continuing without alignment.")
+            except FuturesTimeoutError:
+                logger.warning(f"Alignment timed out after {ALIGNMENT_TIMEOUT}s. Continuing without alignment.")
                 # Continue with original result without alignment
                 pass
             except Exception as align_error:
@@ -443,123 +854,76 @@ class AudioProcessingService:
                 logger.warning("3) Set HUGGINGFACE_TOKEN environment variable")
             
             try:
-                # Set timeout for diarization (10 minutes)
-                def diarization_timeout_handler(signum, frame):
-                    raise TimeoutError("Speaker diarization timed out")
+                # Enhanced diarization with custom parameters
+                diarize_model = _get_cached_model(
+                    ('diarize', device),
+                    lambda: whisperx.DiarizationPipeline(use_auth_token=hf_token, device=device)
+                )
+                logger.info("Diarization model loaded")
                 
-                old_handler = signal.signal(signal.SIGALRM, diarization_timeout_handler)
-                signal.alarm(600)  # 10 minutes timeout
+                # Log audio characteristics for debugging
+                logger.info(f"Audio duration: {audio_duration:.2f} seconds")
+                logger.info(f"Audio samples: {len(audio)}")
                 
-                try:
-                    # Enhanced diarization with custom parameters
-                    diarize_model = whisperx.DiarizationPipeline(
-                        use_auth_token=hf_token, 
-                        device=device
-                    )
-                    logger.info("Diarization model loaded")
-                    
-                    # Log audio characteristics for debugging
-                    audio_duration = len(audio) / 16000  # WhisperX uses 16kHz
-                    logger.info(f"Audio duration: {audio_duration:.2f} seconds")
-                    logger.info(f"Audio samples: {len(audio)}")
-                    
-                    # Run diarization with custom parameters
-                    logger.info("Running speaker diarization...")
-                    
-                    # Get diarization parameters from settings
-                    min_speakers = getattr(settings, 'DIARIZATION_MIN_SPEAKERS', 1)
-                    max_speakers = getattr(settings, 'DIARIZATION_MAX_SPEAKERS', 8)
-                    
-                    logger.info(f"Running diarization with min_speakers={min_speakers}, max_speakers={max_speakers}")
-                    
-                    # Pass additional parameters to improve speaker separation
-                    diarize_segments = diarize_model(
-                        audio,
-                        min_speakers=min_speakers,
-                        max_speakers=max_speakers
-                    )
-                    
-                    # Debug diarization results
-                    speaker_labels = diarize_segments.get_labels()
-                    unique_speakers = list(set(speaker_labels))
-                    logger.info(f"Diarization completed. Found {len(unique_speakers)} unique speakers: {unique_speakers}")
-                    
-                    # Log speaker timeline for debugging
+                # Run diarization with custom parameters
+                logger.info("Running speaker diarization...")
+                
+                # Get diarization parameters from settings
+                min_speakers = getattr(settings, 'DIARIZATION_MIN_SPEAKERS', 1)
+                max_speakers = getattr(settings, 'DIARIZATION_MAX_SPEAKERS', 8)
+                
+                logger.info(f"Running diarization with min_speakers={min_speakers}, max_speakers={max_speakers}")
+                
+                # Pass additional parameters to improve speaker separation
+                future = _aux_pool.submit(
+                    diarize_model,
+                    audio,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers
+                )
+                diarize_segments = future.result(timeout=DIARIZATION_TIMEOUT)
+                
+                # Debug diarization results
+                speaker_labels = diarize_segments.get_labels()
+                unique_speakers = list(set(speaker_labels))
+                logger.info(f"Diarization completed. Found {len(unique_speakers)} unique speakers: {unique_speakers}")
+                
+                # Log speaker timeline for debugging
+                if logger.isEnabledFor(logging.DEBUG):
                     for turn, _, speaker in diarize_segments.itertracks(yield_label=True):
-                        logger.info(f"Speaker {speaker}: {turn.start:.2f}s - {turn.end:.2f}s ({turn.end - turn.start:.2f}s duration)")
-                    
-                    # Assign speakers to segments
-                    self.update_job_status(job_id, 'processing', 'transcribing', 58, 
-                                         f"Assigning {len(unique_speakers)} speakers to segments...")
-                    
-                    logger.info(f"Assigning speakers to {len(result.get('segments', []))} transcription segments")
-                    result = whisperx.assign_word_speakers(diarize_segments, result)
-                    
-                    # Debug speaker assignment results
-                    assigned_speakers = set()
-                    for segment in result.get('segments', []):
-                        if 'speaker' in segment:
-                            assigned_speakers.add(segment['speaker'])
-                    
-                    logger.info(f"Speaker assignment completed. Segments have speakers: {list(assigned_speakers)}")
-                    
-                finally:
-                    # Reset alarm
-                    signal.alarm(0)
-                    signal.signal(signal.SIGALRM, old_handler)
+                        logger.debug("Speaker %s: %.2fs - %.2fs (%.2fs duration)",
+                                     speaker, turn.start, turn.end, turn.end - turn.start)
                 
-            except TimeoutError as timeout_error:
-                logger.warning(f"Speaker diarization timed out: {timeout_error}. Using fallback speaker labels.")
+                # Assign speakers to segments
+                self.update_job_status(job_id, 'processing', 'transcribing', 58, 
+                                     f"Assigning {len(unique_speakers)} speakers to segments...")
                 
-                # Apply same fallback logic as above
-                segments = result.get("segments", [])
-                if len(segments) > 1:
-                    current_speaker = 0
-                    last_end_time = 0
-                    
-                    for segment in segments:
-                        start_time = segment.get('start', 0)
-                        if start_time - last_end_time > 2.0:
-                            current_speaker = 1 - current_speaker
-                        
-                        segment["speaker"] = f"SPEAKER_{current_speaker:02d}"
-                        last_end_time = segment.get('end', start_time)
-                        
-                    logger.info(f"Applied timeout fallback speaker assignment")
-                else:
-                    for segment in segments:
-                        segment["speaker"] = "SPEAKER_00"
+                logger.info(f"Assigning speakers to {len(result.get('segments', []))} transcription segments")
+                result = whisperx.assign_word_speakers(diarize_segments, result)
+                
+                # Debug speaker assignment results
+                assigned_speakers = set()
+                for segment in result.get('segments', []):
+                    if 'speaker' in segment:
+                        assigned_speakers.add(segment['speaker'])
+                
+                logger.info(f"Speaker assignment completed. Segments have speakers: {list(assigned_speakers)}")
+                
+            except FuturesTimeoutError:
+                logger.warning(f"Speaker diarization timed out after {DIARIZATION_TIMEOUT}s. Using fallback speaker labels.")
+                
+                self.assign_fallback_speakers(result.get("segments", []))
             except Exception as diarize_error:
                 logger.error(f"Speaker diarization failed: {diarize_error}")
-                import traceback
                 logger.error(f"Diarization traceback: {traceback.format_exc()}")
                 
                 logger.warning("Falling back to simple speaker assignment based on transcript segments")
                 
                 # Try to create basic speaker separation based on transcript timing
-                segments = result.get("segments", [])
-                if len(segments) > 1:
-                    # Simple heuristic: alternate speakers based on gaps in speech
-                    current_speaker = 0
-                    last_end_time = 0
-                    
-                    for segment in segments:
-                        start_time = segment.get('start', 0)
-                        # If there's a significant gap (>2 seconds), might be different speaker
-                        if start_time - last_end_time > 2.0:
-                            current_speaker = 1 - current_speaker  # Toggle between 0 and 1
-                        
-                        segment["speaker"] = f"SPEAKER_{current_speaker:02d}"
-                        last_end_time = segment.get('end', start_time)
-                        
-                    logger.info(f"Applied fallback speaker assignment to {len(segments)} segments")
-                else:
-                    # Single segment, assign to single speaker
-                    for segment in segments:
-                        segment["speaker"] = "SPEAKER_00"
-            
-            # Clean up GPU memory
-            if device == "cuda":
+                self.assign_fallback_speakers(result.get("segments", []))
+            
+            # Clean up GPU memory periodically; cached models stay resident between jobs
+            if device == "cuda" and _should_empty_cuda_cache():
                 torch.cuda.empty_cache()
             
             logger.info(f"WhisperX transcription completed for job {job_id}")
@@ -568,16 +932,60 @@ class AudioProcessingService:
         except Exception as e:
             logger.error(f"Error in WhisperX transcription: {str(e)}")
             logger.error(f"Falling back to mock implementation due to error")
-            import traceback
             logger.error(f"WhisperX traceback: {traceback.format_exc()}")
             
             # Fall back to mock implementation if WhisperX fails
             return self._run_mock_whisperx(job_id)
     
+    def pick_batch_size(self, torch, device: str, duration_sec: float) -> int:
+        """Transcription batch size for the clip length and the free device memory"""
+        # Short clips produce only a few VAD chunks, so batching only adds padding
+        if duration_sec < 30:
+            return 1
+        
+        batch_size = settings.WHISPERX_BATCH_SIZE
+        if device == "cuda":
+            free_vram = torch.cuda.mem_get_info()[0]
+            batch_size = min(batch_size, max(1, free_vram // BATCH_VRAM_BYTES))
+        return batch_size
+    
+    def load_audio(self, whisperx, wav_path: str) -> np.ndarray:
+        """Load audio as float32 samples at 16kHz, reading conforming WAVs directly"""
+        try:
+            info = sf.info(wav_path)
+            if (info.samplerate == WHISPERX_SAMPLE_RATE and info.channels == 1
+                    and info.subtype == 'PCM_16'):
+                # Same scaling as whisperx.load_audio, without spawning another ffmpeg
+                audio, _ = sf.read(wav_path, dtype='float32')
+                return audio
+        except Exception as e:
+            logger.warning(f"Could not read {wav_path} with soundfile: {e}")
+        return whisperx.load_audio(wav_path)
+    
+    def assign_fallback_speakers(self, segments: List[Dict]):
+        """Alternate between two speakers at every gap in speech longer than 2 seconds"""
+        if len(segments) <= 1:
+            # Single segment, assign to single speaker
+            for segment in segments:
+                segment["speaker"] = "SPEAKER_00"
+            return
+        
+        starts = np.fromiter((segment.get('start', 0) for segment in segments),
+                             dtype=np.float64, count=len(segments))
+        ends = np.fromiter((segment.get('end', segment.get('start', 0)) for segment in segments),
+                           dtype=np.float64, count=len(segments))
+        
+        # Gap before each segment, measured from the previous segment's end (or 0 for the first)
+        previous_ends = np.concatenate(([0.0], ends[:-1]))
+        speakers = np.cumsum(starts - previous_ends > 2.0) & 1
+        
+        for segment, speaker in zip(segments, speakers.tolist()):
+            segment["speaker"] = f"SPEAKER_{speaker:02d}"
+        
+        logger.info(f"Applied fallback speaker assignment to {len(segments)} segments")
+    
     def _run_mock_whisperx(self, job_id: str) -> Dict:
         """Fallback mock implementation when WhisperX is not available"""
-        import time
-        
         logger.info("Running mock WhisperX implementation")
         self.update_job_status(job_id, 'processing', 'transcribing', 35, 
                              "Processing audio with mock WhisperX...")
@@ -590,64 +998,32 @@ class AudioProcessingService:
                                  f"Mock WhisperX processing... {i+1}/5")
             logger.info(f"Mock WhisperX simulation step {i+1}/5")
         
-        # Enhanced mock WhisperX result structure with better speaker variation
+        # Fresh segment dicts per call: downstream steps may rewrite speakers in place
         mock_result = {
             "language": "en",
-            "segments": [
-                {
-                    "start": 0.0,
-                    "end": 3.0,
-                    "text": "Hello, welcome to our podcast.",
-                    "speaker": "SPEAKER_00"
-                },
-                {
-                    "start": 3.5,
-                    "end": 7.0,
-                    "text": "Thank you for having me.",
-                    "speaker": "SPEAKER_01"
-                },
-                {
-                    "start": 7.5,
-                    "end": 11.0,
-                    "text": "Let's talk about the topic.",
-                    "speaker": "SPEAKER_00"
-                },
-                {
-                    "start": 11.5,
-                    "end": 15.0,
-                    "text": "That sounds interesting.",
-                    "speaker": "SPEAKER_01"
-                },
-                {
-                    "start": 15.5,
-                    "end": 19.0,
-                    "text": "I think we should discuss this further.",
-                    "speaker": "SPEAKER_00"
-                },
-                {
-                    "start": 19.5,
-                    "end": 23.0,
-                    "text": "Absolutely, I agree with that point.",
-                    "speaker": "SPEAKER_01"
-                }
-            ]
+            "segments": [dict(segment) for segment in _MOCK_SEGMENTS],
         }
         
-        logger.info(f"Mock result created with {len(mock_result['segments'])} segments and 2 speakers")
-        
-        # Log mock speaker distribution
-        speaker_counts = {}
-        for segment in mock_result['segments']:
-            speaker = segment['speaker']
-            speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
-        
-        logger.info(f"Mock speaker distribution: {speaker_counts}")
+        logger.info(f"Mock result created with {len(_MOCK_SEGMENTS)} segments and 2 speakers")
+        logger.info(f"Mock speaker distribution: {_MOCK_SPEAKER_COUNTS}")
         logger.info(f"Mock WhisperX transcription completed for job {job_id}")
         return mock_result
     
-    def separate_speakers(self, wav_path: str, transcription_result: Dict, 
-                         job_id: str) -> List[str]:
-        """Separate audio by speakers and save individual tracks"""
+    def group_segments_by_speaker(self, transcription_result: Dict) -> Tuple[Dict[str, List[Dict]], Dict[str, int]]:
+        """Group transcript segments by speaker and count each speaker's words in the same pass"""
+        speaker_segments = {}
+        word_counts = defaultdict(int)
+        for segment in transcription_result.get('segments', []):
+            speaker = segment.get('speaker', 'UNKNOWN')
+            speaker_segments.setdefault(speaker, []).append(segment)
+            word_counts[speaker] += len(segment.get('text', '').split())
+        
+        logger.info(f"Found {len(speaker_segments)} unique speakers: {list(speaker_segments.keys())}")
+        return speaker_segments, dict(word_counts)
+    
+    def separate_speakers(self, wav_path: str, speaker_segments: Dict[str, List[Dict]], 
+                         job_id: str) -> List[Tuple[str, float]]:
+        """Separate audio by speakers and save individual tracks as (path, duration_seconds)"""
         try:
             # Check if job is cancelled
             if self.check_job_cancelled(job_id):
@@ -661,72 +1037,104 @@ class AudioProcessingService:
             if not os.path.exists(wav_path):
                 raise FileNotFoundError(f"WAV file not found: {wav_path}")
             
-            logger.info(f"Loading audio from: {wav_path}")
-            # Load the original audio
-            audio = AudioSegment.from_wav(wav_path)
-            logger.info(f"Audio loaded for separation - Duration: {len(audio)/1000:.2f}s")
-            
-            # Group segments by speaker
-            logger.info("Grouping segments by speaker...")
-            speaker_segments = {}
-            total_segments = len(transcription_result.get('segments', []))
-            logger.info(f"Processing {total_segments} segments")
-            
-            for i, segment in enumerate(transcription_result.get('segments', [])):
-                speaker = segment.get('speaker', 'UNKNOWN')
-                if speaker not in speaker_segments:
-                    speaker_segments[speaker] = []
-                    logger.info(f"Found new speaker: {speaker}")
-                speaker_segments[speaker].append(segment)
-            
-            logger.info(f"Found {len(speaker_segments)} unique speakers: {list(speaker_segments.keys())}")
+            logger.info(f"Reading audio parameters from: {wav_path}")
+            # Only the header is read here; each track reads just its own segments
+            with wave.open(wav_path, 'rb') as wav:
+                sample_rate = wav.getframerate()
+                total_frames = wav.getnframes()
+                if wav.getsampwidth() != 2:
+                    raise ValueError(f"Expected 16-bit PCM WAV, got {wav.getsampwidth() * 8}-bit: {wav_path}")
+            logger.info(f"Audio ready for separation - Duration: {total_frames / sample_rate:.2f}s")
             
             # Create output directory for this job
             job_output_dir = self.output_dir / job_id
             job_output_dir.mkdir(parents=True, exist_ok=True)
             
-            speaker_files = []
+            speaker_paths = {speaker_id: job_output_dir / f"{speaker_id}.wav" for speaker_id in speaker_segments}
+            durations = {}
             total_speakers = len(speaker_segments)
             
-            for speaker_idx, (speaker_id, segments) in enumerate(speaker_segments.items()):
-                # Check if job is cancelled
-                if self.check_job_cancelled(job_id):
-                    raise Exception("Job cancelled by user")
-                    
-                logger.info(f"Processing speaker {speaker_idx + 1}/{total_speakers}: {speaker_id} ({len(segments)} segments)")
-                
-                # Update progress for this speaker
-                speaker_progress = 65 + (speaker_idx * 20 // total_speakers)
-                self.update_job_status(job_id, 'processing', 'separating', speaker_progress, 
-                                     f"Processing speaker {speaker_idx + 1}/{total_speakers}: {speaker_id}")
-                # Create audio for this speaker
-                speaker_audio = AudioSegment.empty()
+            # Speakers are independent and the NumPy copies and file writes release the GIL
+            workers = max(1, min(os.cpu_count() or 1, total_speakers))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='speaker-mix') as pool:
+                futures = {
+                    pool.submit(self.write_speaker_track, wav_path,
+                                segments, speaker_paths[speaker_id]): speaker_id
+                    for speaker_id, segments in speaker_segments.items()
+                }
                 
-                for segment in segments:
-                    start_ms = int(segment['start'] * 1000)
-                    end_ms = int(segment['end'] * 1000)
-                    segment_audio = audio[start_ms:end_ms]
-                    speaker_audio += segment_audio
+                for done, future in enumerate(as_completed(futures), start=1):
+                    # Check if job is cancelled
+                    if self.check_job_cancelled(job_id):
+                        for pending in futures:
+                            pending.cancel()
+                        raise Exception("Job cancelled by user")
                     
-                    # Add small gap between segments
-                    speaker_audio += AudioSegment.silent(duration=500)
-                
-                # Save speaker audio file
-                speaker_filename = f"{speaker_id}.wav"
-                speaker_path = job_output_dir / speaker_filename
-                speaker_audio.export(speaker_path, format="wav")
-                
-                speaker_files.append(str(speaker_path))
-                logger.info(f"Created speaker file: {speaker_path}")
+                    speaker_id = futures[future]
+                    durations[speaker_id] = future.result()
+                    logger.info("Created speaker file: %s (%.2fs)", speaker_paths[speaker_id], durations[speaker_id])
+                    
+                    # Update progress for this speaker
+                    speaker_progress = 65 + (done * 20 // total_speakers)
+                    self.update_job_status(job_id, 'processing', 'separating', speaker_progress, 
+                                         f"Processed speaker {done}/{total_speakers}: {speaker_id}")
             
-            return speaker_files
+            return [(str(path), durations[speaker_id]) for speaker_id, path in speaker_paths.items()]
             
         except Exception as e:
             logger.error(f"Error separating speakers: {str(e)}")
             raise
     
-    def finalize_processing(self, job_id: str, speaker_files: List[str], 
-                           transcription_result: Dict):
+    def coalesce_segments(self, segments: List[Dict]) -> List[List[float]]:
+        """Merge a speaker's segments separated by less than SEGMENT_MERGE_GAP into [start, end] spans"""
+        spans = []
+        for segment in sorted(segments, key=lambda seg: seg['start']):
+            start, end = segment['start'], segment['end']
+            if spans and start - spans[-1][1] < SEGMENT_MERGE_GAP:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+        return spans
+    
+    def write_speaker_track(self, wav_path: str, segments: List[Dict], speaker_path: Path) -> float:
+        """Write one speaker's segments, separated by silence, to a WAV file and return its duration"""
+        spans = self.coalesce_segments(segments)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing speaker %s (%d segments, %d after merging)",
+                         speaker_path.stem, len(segments), len(spans))
+        
+        # Each track opens its own reader, so tracks can be written concurrently
+        with wave.open(wav_path, 'rb') as source:
+            sample_rate = source.getframerate()
+            channels = source.getnchannels()
+            total_frames = source.getnframes()
+            
+            # Span bounds rounded to the nearest frame in one vectorized pass, clipped to the audio
+            count = len(spans)
+            bounds = np.array(spans, dtype=np.float64).reshape(count, 2)
+            frames = np.rint(bounds * sample_rate).astype(np.int64)
+            starts, ends = frames[:, 0], frames[:, 1]
+            np.clip(starts, 0, total_frames, out=starts)
+            np.clip(ends, starts, total_frames, out=ends)
+            lengths = ends - starts
+            
+            gap = sample_rate // 2
+            total_samples = int(lengths.sum()) + gap * count
+            silence_bytes = _silence_bytes(gap, channels)
+            
+            # Read only each segment's frames and stream them, followed by a small gap,
+            # through libsndfile; closing the file patches the RIFF sizes
+            with sf.SoundFile(str(speaker_path), 'w', samplerate=sample_rate, channels=channels,
+                              subtype='PCM_16', format='WAV') as speaker_wav:
+                for start, length in zip(starts.tolist(), lengths.tolist()):
+                    source.setpos(start)
+                    speaker_wav.buffer_write(source.readframes(length), dtype='int16')
+                    speaker_wav.buffer_write(silence_bytes, dtype='int16')
+        
+        return total_samples / sample_rate
+    
+    def finalize_processing(self, job_id: str, speaker_files: List[Tuple[str, float]], 
+                           word_counts: Dict[str, int]):
         """Finalize processing and create speaker track records"""
         try:
             logger.info(f"Starting finalization for job {job_id} with {len(speaker_files)} speaker files")
@@ -736,46 +1144,38 @@ class AudioProcessingService:
             logger.info("Updating job record with results...")
             job = ProcessingJob.objects.get(job_id=job_id)
             job.speaker_count = len(speaker_files)
-            job.output_directory = str(Path(speaker_files[0]).parent)
-            job.save()
+            job.output_directory = str(Path(speaker_files[0][0]).parent)
+            job.save(update_fields=['speaker_count', 'output_directory'])
             logger.info(f"Job record updated - Speaker count: {job.speaker_count}, Output dir: {job.output_directory}")
             
             # Create speaker track records
             logger.info("Creating speaker track records...")
-            speaker_segments = {}
-            for segment in transcription_result.get('segments', []):
-                speaker = segment.get('speaker', 'UNKNOWN')
-                if speaker not in speaker_segments:
-                    speaker_segments[speaker] = []
-                speaker_segments[speaker].append(segment)
-            
-            logger.info(f"Grouped segments for {len(speaker_segments)} speakers")
             
-            for i, speaker_file in enumerate(speaker_files):
+            tracks = []
+            for speaker_file, duration_seconds in speaker_files:
                 speaker_id = Path(speaker_file).stem
-                logger.info(f"Creating track record for speaker {i+1}/{len(speaker_files)}: {speaker_id}")
+                word_count = word_counts.get(speaker_id, 0)
                 
-                # Calculate duration and word count
-                audio = AudioSegment.from_wav(speaker_file)
-                duration_seconds = len(audio) / 1000.0
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Speaker %s - Duration: %.2fs, Words: %d", speaker_id, duration_seconds, word_count)
                 
-                segments = speaker_segments.get(speaker_id, [])
-                word_count = sum(len(segment.get('text', '').split()) for segment in segments)
-                
-                logger.info(f"Speaker {speaker_id} - Duration: {duration_seconds:.2f}s, Words: {word_count}")
-                
-                SpeakerTrack.objects.create(
+                tracks.append(SpeakerTrack(
                     job=job,
                     speaker_id=speaker_id,
                     audio_file_path=speaker_file,
                     duration_seconds=duration_seconds,
                     word_count=word_count
-                )
-                
-                # Update progress
-                progress = 92 + (i * 6 // len(speaker_files))
-                self.update_job_status(job_id, 'processing', 'finalizing', progress, 
-                                     f"Created track record for {speaker_id}")
+                ))
+            
+            # Insert all track records in one transaction
+            with transaction.atomic():
+                SpeakerTrack.objects.bulk_create(tracks, batch_size=100)
+            logger.info("Created %d track records: %.2fs of audio, %d words",
+                        len(tracks), sum(track.duration_seconds for track in tracks),
+                        sum(track.word_count for track in tracks))
+            
+            self.update_job_status(job_id, 'processing', 'finalizing', 98, 
+                                 f"Created {len(tracks)} track records")
             
             self.update_job_status(job_id, 'completed', 'completed', 100, 
                                  f"Processing complete! Identified {len(speaker_files)} speakers.")
@@ -785,6 +1185,18 @@ class AudioProcessingService:
         except Exception as e:
             logger.error(f"Error finalizing processing: {str(e)}")
             raise
+    def discard_temp_file(self, path: str):
+        """Evict a temporary file from the page cache and delete it"""
+        try:
+            with open(path, 'rb') as temp_file:
+                _drop_page_cache(temp_file.fileno())
+            os.unlink(path)
+            logger.info(f"Cleaned up temp file: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not clean up temp file {path}: {str(e)}")
+    
     def run_separation_pipeline(self, job_id: str):
         """Main pipeline for audio separation processing"""
         try:
@@ -797,39 +1209,38 @@ class AudioProcessingService:
             self.update_job_status(job_id, 'processing', 'initializing', 5, 
                                  "Starting audio processing pipeline...")
             
-            # Step 1: Convert to WAV
-            logger.info("=== STEP 1: Converting to WAV ===")
-            wav_path = self.convert_to_wav(job.uploaded_file_path, job_id)
-            logger.info(f"WAV conversion completed: {wav_path}")
-            
-            # Step 2: Run WhisperX transcription and diarization
-            logger.info("=== STEP 2: WhisperX Transcription ===")
-            transcription_result = self.run_whisperx_transcription(wav_path, job_id)
-            logger.info(f"Transcription completed with {len(transcription_result.get('segments', []))} segments")
-            
-            # Step 3: Separate speakers
-            logger.info("=== STEP 3: Speaker Separation ===")
-            speaker_files = self.separate_speakers(wav_path, transcription_result, job_id)
-            logger.info(f"Speaker separation completed with {len(speaker_files)} files")
+            wav_path = None
+            try:
+                # Step 1: Convert to WAV
+                logger.info("=== STEP 1: Converting to WAV ===")
+                wav_path = self.convert_to_wav(job.uploaded_file_path, job_id)
+                logger.info(f"WAV conversion completed: {wav_path}")
+                
+                # Step 2: Run WhisperX transcription and diarization
+                logger.info("=== STEP 2: WhisperX Transcription ===")
+                transcription_result = self.run_whisperx_transcription(wav_path, job_id)
+                logger.info(f"Transcription completed with {len(transcription_result.get('segments', []))} segments")
+                
+                # Group segments by speaker once for separation and finalization
+                speaker_segments, word_counts = self.group_segments_by_speaker(transcription_result)
+                
+                # Step 3: Separate speakers
+                logger.info("=== STEP 3: Speaker Separation ===")
+                speaker_files = self.separate_speakers(wav_path, speaker_segments, job_id)
+                logger.info(f"Speaker separation completed with {len(speaker_files)} files")
+            finally:
+                # The intermediate WAV is dead once the tracks are written or the job failed
+                if wav_path:
+                    self.discard_temp_file(wav_path)
             
             # Step 4: Finalize processing
             logger.info("=== STEP 4: Finalizing ===")
-            self.finalize_processing(job_id, speaker_files, transcription_result)
+            self.finalize_processing(job_id, speaker_files, word_counts)
             logger.info("Pipeline completed successfully")
             
-            # Cleanup temporary files
-            logger.info("Cleaning up temporary files...")
-            try:
-                if 'wav_path' in locals() and os.path.exists(wav_path):
-                    os.remove(wav_path)
-                    logger.info(f"Cleaned up temp file: {wav_path}")
-            except Exception as e:
-                logger.warning(f"Could not clean up temp file {wav_path}: {str(e)}")
-            
         except Exception as e:
             logger.error(f"Pipeline error for job {job_id}: {str(e)}")
             logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
             logger.error(f"Full traceback: {traceback.format_exc()}")
             
             self.update_job_status(job_id, 'failed', 'error', 0, 
@@ -839,93 +1250,65 @@ class AudioProcessingService:
             try:
                 job = ProcessingJob.objects.get(job_id=job_id)
                 job.error_message = str(e)
-                job.save()
+                job.save(update_fields=['error_message'])
             except Exception as db_error:
                 logger.error(f"Could not update job error message: {str(db_error)}")
     
     def clean_stale_cache_entries(self):
-        """Clean up stale cache entries for stuck jobs"""
-        from django.utils import timezone
-        import datetime
+        """Fail jobs still processing past their deadline and drop their cached state"""
+        # Pop only the deadlines that have passed instead of scanning every cached job
+        now = time.monotonic()
+        expired = []
+        with _expiry_lock:
+            while _expiry_heap and _expiry_heap[0][0] <= now:
+                expired.append(heapq.heappop(_expiry_heap)[1])
+        if not expired:
+            return
         
-        stale_jobs = []
-        for job_id, status in list(job_statuses.items()):
-            try:
-                job = ProcessingJob.objects.get(job_id=job_id)
-                
-                # Check if job has been processing for too long (30 minutes)
-                if (job.status == 'processing' and 
-                    job.started_at and 
-                    (timezone.now() - job.started_at) > datetime.timedelta(minutes=30)):
-                    
-                    logger.warning(f"Job {job_id} appears stuck, cleaning cache and marking as failed")
-                    
-                    # Update database to failed status
-                    job.status = 'failed'
-                    job.current_step = 'failed'
-                    job.progress_percentage = 0
-                    job.error_message = "Processing timed out after 30 minutes"
-                    job.completed_at = timezone.now()
-                    job.save()
-                    
-                    # Remove from cache
-                    stale_jobs.append(job_id)
-                    
-            except ProcessingJob.DoesNotExist:
-                # Job doesn't exist in database, remove from cache
-                stale_jobs.append(job_id)
-        
-        # Clean up stale entries
-        for job_id in stale_jobs:
-            if job_id in job_statuses:
-                del job_statuses[job_id]
-                logger.info(f"Removed stale cache entry for job {job_id}")
+        with _flush_lock:
+            stale_jobs = list(ProcessingJob.objects.filter(
+                job_id__in=expired, status='processing'
+            ).values_list('job_id', flat=True))
+            if not stale_jobs:
+                return
+            
+            # Update database to failed status
+            ProcessingJob.objects.filter(job_id__in=stale_jobs).update(
+                status='failed',
+                current_step='failed',
+                progress_percentage=0,
+                error_message="Processing timed out after 30 minutes",
+                completed_at=timezone.now()
+            )
+            
+            # Stop the worker from publishing further progress and drop the cached status
+            for job_id in stale_jobs:
+                logger.warning(f"Job {job_id} appears stuck, cleaning cache and marking as failed")
+                job_registry.cancel(str(job_id))
 
     def get_job_status(self, job_id: str) -> Dict:
-        """Get current job status"""
+        """Get current job status, served from memory while the job is running"""
         try:
-            logger.info(f"Getting job status for {job_id}")
+            _ensure_stale_cleanup()
             
-            # Clean stale cache entries periodically
-            import random
-            if random.random() < 0.1:  # 10% chance to clean cache
-                self.clean_stale_cache_entries()
-            
-            # Always check database first for completed/failed jobs to ensure accuracy
-            job = ProcessingJob.objects.get(job_id=job_id)
-            
-            # If job is completed or failed, always return fresh database status
-            if job.status in ['completed', 'failed']:
-                status = {
-                    'status': job.status,
-                    'step': job.current_step,
-                    'progress': job.progress_percentage,
-                    'message': f"Current step: {job.get_current_step_display()}"
-                }
-                logger.info(f"Job {job_id} is {job.status}, returning database status: {status}")
-                # Update memory cache with final status
-                job_statuses[job_id] = status
-                return status
-            
-            # For processing jobs, use memory cache if available (faster for frequent updates)
-            if job_id in job_statuses:
-                memory_status = job_statuses[job_id]
-                logger.info(f"Found processing job in memory: {memory_status}")
+            # Jobs running in this process write their progress to memory first, so skip the database;
+            # anything else may be progressing (or finished) in another worker
+            memory_status = job_registry.get_status(job_id)
+            if (memory_status is not None and memory_status['status'] in ('pending', 'processing')
+                    and job_registry.owns(job_id)):
                 return memory_status
             
-            # Fall back to database for processing jobs not in cache
-            logger.info(f"Processing job not in memory, using database for job {job_id}")
+            # Unknown jobs and terminal states are confirmed against the database
+            job = ProcessingJob.objects.only(
+                'status', 'current_step', 'progress_percentage'
+            ).get(job_id=job_id)
             status = {
                 'status': job.status,
                 'step': job.current_step,
                 'progress': job.progress_percentage,
                 'message': f"Current step: {job.get_current_step_display()}"
             }
-            
-            logger.info(f"Database status: {status}")
-            
-            # Update memory cache
-            job_statuses[job_id] = status
+            logger.info(f"Job {job_id} not running in memory, returning database status: {status}")
             return status
             
         except ProcessingJob.DoesNotExist:
@@ -938,7 +1321,6 @@ class AudioProcessingService:
             }
         except Exception as e:
             logger.error(f"Error getting job status: {str(e)}")
-            import traceback
             logger.error(f"Get status traceback: {traceback.format_exc()}")
             return {
                 'status': 'error',
@@ -952,32 +1334,76 @@ class AudioProcessingService:
 audio_service = AudioProcessingService()
 
 
+# Seconds between sweeps for jobs stuck in processing
+STALE_CLEANUP_INTERVAL = 60
+
+# Seconds a job may run before the sweep marks it as failed
+STALE_JOB_TIMEOUT = 30 * 60
+
+# Min-heap of (monotonic deadline, job_id) for jobs that have started running
+_expiry_heap = []
+_expiry_lock = threading.Lock()
+
+_stale_cleanup_lock = threading.Lock()
+_stale_cleanup_started = False
+
+
+def _track_job_deadline(job_id: str):
+    """Schedule a running job for the stale-job sweep"""
+    _ensure_stale_cleanup()
+    with _expiry_lock:
+        heapq.heappush(_expiry_heap, (time.monotonic() + STALE_JOB_TIMEOUT, job_id))
+
+
+def _ensure_stale_cleanup():
+    """Start the periodic stale-entry sweep on first use"""
+    global _stale_cleanup_started
+    if not _stale_cleanup_started:
+        with _stale_cleanup_lock:
+            if not _stale_cleanup_started:
+                _schedule_stale_cleanup()
+                _stale_cleanup_started = True
+
+
+def _schedule_stale_cleanup():
+    timer = threading.Timer(STALE_CLEANUP_INTERVAL, _run_stale_cleanup)
+    timer.daemon = True
+    timer.start()
+
+
+def _run_stale_cleanup():
+    """Sweep stale cache entries off the request path, then re-arm the timer"""
+    try:
+        audio_service.clean_stale_cache_entries()
+    except Exception as e:
+        logger.error(f"Error cleaning stale cache entries: {str(e)}")
+    finally:
+        close_old_connections()
+        _schedule_stale_cleanup()
+
+
 def start_processing_job(job_id: str):
-    """Start processing job in a separate thread"""
+    """Queue processing job on the bounded job pool"""
     def run_job():
         try:
             logger.info(f"Processing thread started for job {job_id}")
+            _track_job_deadline(job_id)
             audio_service.run_separation_pipeline(job_id)
             logger.info(f"Processing thread completed for job {job_id}")
         except Exception as e:
             logger.error(f"Unexpected error in processing thread for job {job_id}: {str(e)}")
-            import traceback
             logger.error(f"Thread traceback: {traceback.format_exc()}")
-        finally:
-            # Clean up thread tracking
-            if job_id in job_threads:
-                del job_threads[job_id]
-            if job_id in job_cancellations:
-                del job_cancellations[job_id]
     
-    # Start processing in a separate thread
-    thread = threading.Thread(target=run_job, daemon=True)
-    thread.start()
+    # Queue processing; at most MAX_CONCURRENT_JOBS pipelines run at once
+    future = _job_pool.submit(run_job)
     
-    # Track the thread
-    job_threads[job_id] = thread
+    # Track the future; once the job is done its in-memory state is dropped and polls read
+    # the database. The callback also fires for jobs cancelled while queued, and runs
+    # immediately if the job has already finished
+    job_registry.set(job_id, 'future', future)
+    future.add_done_callback(lambda _: job_registry.clear(job_id, 'future', 'cancelled', 'pk', 'status'))
     
-    logger.info(f"Started processing thread for job {job_id}")
+    logger.info(f"Queued processing job {job_id}")
 
 
 def get_job_status(job_id: str) -> Dict:
@@ -995,7 +1421,7 @@ def cancel_all_jobs() -> int:
     cancelled_count = 0
     
     # Get all processing jobs
-    running_jobs = [job_id for job_id, status in job_statuses.items() 
+    running_jobs = [job_id for job_id, status in job_registry.items('status')
                    if status.get('status') == 'processing']
     
     for job_id in running_jobs:
@@ -1009,6 +1435,51 @@ def cancel_all_jobs() -> int:
     return cancelled_count
 
 
+# Speaker track paths never change once written, so cache them for a day
+SPEAKER_PATH_CACHE_TTL = 24 * 60 * 60
+
+
+# Completed results never change except through speaker relabelling
+RESULTS_CACHE_TTL = 60 * 60
+
+
+def _speaker_path_key(job_id, speaker_id: str) -> str:
+    return f"path:{job_id}:{speaker_id}"
+
+
+def results_cache_key(job_id) -> str:
+    return f"results:{job_id}"
+
+
+def invalidate_results_cache(job_id, speaker_ids=()):
+    """Drop a job's cached results page and the download paths of the given speakers"""
+    cache.delete_many([results_cache_key(job_id)]
+                      + [_speaker_path_key(job_id, speaker_id) for speaker_id in speaker_ids])
+
+
+def resolve_speaker_path(job_id, speaker_id: str) -> Optional[Dict]:
+    """Return a speaker track's audio path and download filename, or None if it doesn't exist"""
+    key = _speaker_path_key(job_id, speaker_id)
+    entry = cache.get(key)
+    if entry is None:
+        speaker_track = (
+            SpeakerTrack.objects.select_related('job')
+            .only('speaker_id', 'speaker_label', 'audio_file_path', 'job__original_filename')
+            .filter(job__job_id=job_id, speaker_id=speaker_id)
+            .first()
+        )
+        if speaker_track is None:
+            return None
+        
+        display_name = speaker_track.display_name.replace(' ', '_')
+        entry = {
+            'path': speaker_track.audio_file_path,
+            'filename': f"{display_name}_{speaker_track.job.original_filename}",
+        }
+        cache.set(key, entry, SPEAKER_PATH_CACHE_TTL)
+    return entry
+
+
 def update_speaker_label(job_id: str, speaker_id: str, new_label: str) -> bool:
     """Update speaker label"""
     try:
@@ -1016,6 +1487,8 @@ def update_speaker_label(job_id: str, speaker_id: str, new_label: str) -> bool:
         speaker_track = SpeakerTrack.objects.get(job=job, speaker_id=speaker_id)
         speaker_track.speaker_label = new_label
         speaker_track.save()
+        # The results page and the download filename both show the label
+        invalidate_results_cache(job_id, [speaker_id])
         logger.info(f"Updated speaker label: {speaker_id} -> {new_label}")
         return True
     except Exception as e:
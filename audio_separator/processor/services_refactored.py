@@ -1,21 +1,99 @@
 import os
+import time
 import uuid
+import wave
 import logging
+import subprocess
 import asyncio
+import threading
+from collections import defaultdict
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files.move import file_move_safe
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from asgiref.sync import sync_to_async, async_to_sync
-from pydub import AudioSegment
 from .models import ProcessingJob, SpeakerTrack
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Global dictionary to track job statuses (in production, use Redis/Celery)
-job_statuses = {}
+# Chunk size for streaming in-memory uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Job statuses live in the shared cache (Redis in production) so every worker sees them
+STATUS_CACHE_PREFIX = 'status:'
+STATUS_CACHE_TTL = 24 * 60 * 60
+
+# Progress ticks closer than this (seconds / percentage points) skip the database write
+STATUS_FLUSH_INTERVAL = 0.5
+STATUS_FLUSH_MIN_PROGRESS = 1
+
+# job_id -> (monotonic time, status, step, progress) of the last status written to the database.
+# A thread lock rather than asyncio.Lock: async_to_sync callers each run their own event loop
+_last_flushed = {}
+_last_flushed_lock = threading.Lock()
+
+
+# Striped locks so only one caller per job reloads a missing status from the database
+_STATUS_LOCK_STRIPES = 16
+_status_locks = [threading.Lock() for _ in range(_STATUS_LOCK_STRIPES)]
+
+
+def _status_lock(job_id: str) -> threading.Lock:
+    return _status_locks[hash(job_id) % _STATUS_LOCK_STRIPES]
+
+
+def _should_flush_status(job_id: str, status: str, step: str, progress: int) -> bool:
+    """Record a status tick and report whether it should be written to the database"""
+    now = time.monotonic()
+    with _last_flushed_lock:
+        if status in ('completed', 'failed'):
+            _last_flushed.pop(job_id, None)
+            return True
+        
+        last = _last_flushed.get(job_id)
+        if (last is not None
+                and now - last[0] < STATUS_FLUSH_INTERVAL
+                and (status, step) == last[1:3]
+                and progress - last[3] < STATUS_FLUSH_MIN_PROGRESS):
+            return False
+        
+        _last_flushed[job_id] = (now, status, step, progress)
+        return True
+
+
+def _status_key(job_id: str) -> str:
+    return f"{STATUS_CACHE_PREFIX}{job_id}"
+
+
+class _StatusStore:
+    """Dict-style view over the cached job statuses"""
+    
+    def __getitem__(self, job_id):
+        status = cache.get(_status_key(job_id))
+        if status is None:
+            raise KeyError(job_id)
+        return status
+    
+    def __setitem__(self, job_id, status):
+        cache.set(_status_key(job_id), status, STATUS_CACHE_TTL)
+    
+    def __delitem__(self, job_id):
+        cache.delete(_status_key(job_id))
+    
+    def __contains__(self, job_id):
+        return cache.get(_status_key(job_id)) is not None
+    
+    def get(self, job_id, default=None):
+        return cache.get(_status_key(job_id), default)
+
+
+job_statuses = _StatusStore()
 
 class AudioProcessingService:
     """Service class for handling audio separation pipeline with async safety"""
@@ -30,9 +108,12 @@ class AudioProcessingService:
         for path in [self.temp_dir, self.output_dir, settings.AUDIO_UPLOAD_PATH]:
             path.mkdir(parents=True, exist_ok=True)
     
-    @sync_to_async
-    def save_uploaded_file(self, uploaded_file, job_id: str) -> str:
+    async def save_uploaded_file(self, uploaded_file, job_id: str) -> str:
         """Save uploaded file and return path - thread-safe"""
+        return await sync_to_async(self._save_uploaded_file)(uploaded_file, job_id)
+    
+    def _save_uploaded_file(self, uploaded_file, job_id: str) -> str:
+        """Write the upload to AUDIO_UPLOAD_PATH; callers already in sync code use this directly"""
         try:
             # Generate secure filename to prevent path traversal
             file_extension = os.path.splitext(uploaded_file.name)[1].lower()
@@ -44,19 +125,21 @@ class AudioProcessingService:
             file_path = settings.AUDIO_UPLOAD_PATH / filename
             
             # Ensure we're writing within allowed directory
-            if not str(file_path).startswith(str(settings.AUDIO_UPLOAD_PATH)):
+            if not file_path.resolve().is_relative_to(settings.AUDIO_UPLOAD_PATH.resolve()):
                 raise ValueError("Invalid file path detected")
             
-            # Save file with size validation
-            total_size = 0
-            with open(file_path, 'wb+') as destination:
-                for chunk in uploaded_file.chunks():
-                    total_size += len(chunk)
-                    if total_size > settings.MAX_UPLOAD_SIZE:
-                        destination.close()
-                        os.remove(file_path)
-                        raise ValueError("File too large")
-                    destination.write(chunk)
+            # Reject oversized uploads before touching the disk
+            if uploaded_file.size > settings.MAX_UPLOAD_SIZE:
+                raise ValueError("File too large")
+            
+            if hasattr(uploaded_file, 'temporary_file_path'):
+                # Already on disk: rename into place, copying only across filesystems
+                file_move_safe(uploaded_file.temporary_file_path(), str(file_path),
+                               allow_overwrite=True)
+            else:
+                with open(file_path, 'wb') as destination:
+                    for chunk in uploaded_file.chunks(chunk_size=UPLOAD_CHUNK_SIZE):
+                        destination.write(chunk)
             
             logger.info(f"File saved securely: {file_path}")
             return str(file_path)
@@ -65,7 +148,6 @@ class AudioProcessingService:
             logger.error(f"Error saving file: {str(e)}")
             raise
     
-    @sync_to_async
     def create_processing_job(self, uploaded_file) -> ProcessingJob:
         """Create a new processing job with database transaction"""
         try:
@@ -73,7 +155,7 @@ class AudioProcessingService:
             
             with transaction.atomic():
                 # Save the uploaded file
-                file_path = sync_to_async(self.save_uploaded_file)(uploaded_file, job_id)
+                file_path = self._save_uploaded_file(uploaded_file, job_id)
                 
                 # Create job record
                 job = ProcessingJob.objects.create(
@@ -103,30 +185,34 @@ class AudioProcessingService:
                                progress: int, message: str = ""):
         """Update job status with async database operations"""
         try:
-            # Update in-memory status
-            job_statuses[job_id] = {
+            # Update the shared status cache
+            await cache.aset(_status_key(job_id), {
                 'status': status,
                 'step': step,
                 'progress': progress,
                 'message': message
-            }
+            }, STATUS_CACHE_TTL)
+            
+            # Pollers read the cache; coalesce rapid ticks before touching the database
+            if not _should_flush_status(job_id, status, step, progress):
+                return
             
             # Update database asynchronously
             @sync_to_async
             def update_db():
                 try:
-                    with transaction.atomic():
-                        job = ProcessingJob.objects.select_for_update().get(job_id=job_id)
-                        job.status = status
-                        job.current_step = step
-                        job.progress_percentage = progress
-                        
-                        if status == 'processing' and not job.started_at:
-                            job.started_at = timezone.now()
-                        elif status in ['completed', 'failed']:
-                            job.completed_at = timezone.now()
-                        
-                        job.save()
+                    # Single UPDATE of the changed columns; no row lock or read-modify-write
+                    fields = {
+                        'status': status,
+                        'current_step': step,
+                        'progress_percentage': progress,
+                    }
+                    if status == 'processing':
+                        fields['started_at'] = Coalesce('started_at', Value(timezone.now()))
+                    elif status in ['completed', 'failed']:
+                        fields['completed_at'] = timezone.now()
+                    
+                    ProcessingJob.objects.filter(job_id=job_id).update(**fields)
                 except Exception as e:
                     logger.error(f"Database update failed: {str(e)}")
             
@@ -142,15 +228,20 @@ class AudioProcessingService:
             await self.update_job_status(job_id, 'processing', 'converting', 10, 
                                        "Converting audio to WAV format...")
             
-            # Use async file operations
-            @sync_to_async
-            def convert_file():
-                audio = AudioSegment.from_file(input_path)
-                output_path = self.temp_dir / f"{job_id}_converted.wav"
-                audio.export(output_path, format="wav")
-                return str(output_path)
+            # Let ffmpeg decode and resample to the mono 16 kHz WAV WhisperX expects,
+            # without materialising the samples in Python
+            output_path = str(self.temp_dir / f"{job_id}_converted.wav")
+            process = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-y", "-i", input_path,
+                "-ac", "1", "-ar", "16000", "-vn", "-f", "wav", output_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                error_output = stderr.decode(errors='replace').strip()[-500:]
+                raise RuntimeError(f"ffmpeg conversion failed: {error_output}")
             
-            output_path = await convert_file()
             logger.info(f"Audio converted to WAV: {output_path}")
             return output_path
             
@@ -164,53 +255,48 @@ class AudioProcessingService:
             await self.update_job_status(job_id, 'processing', 'finalizing', 90, 
                                        "Finalizing results...")
             
+            # Read every track's WAV header concurrently rather than one after another
+            durations = await asyncio.gather(*(
+                asyncio.to_thread(self.get_wav_duration, speaker_file)
+                for speaker_file in speaker_files
+            ))
+            
+            # Count words per speaker in a single pass over the segments
+            word_counts = defaultdict(int)
+            for segment in transcription_result.get('segments', ()):
+                text = segment.get('text')
+                if text:
+                    word_counts[segment.get('speaker', 'UNKNOWN')] += len(text.split())
+            
             @sync_to_async
             def update_database():
-                with transaction.atomic():
-                    job = ProcessingJob.objects.select_for_update().get(job_id=job_id)
-                    job.speaker_count = len(speaker_files)
-                    if speaker_files:
-                        job.output_directory = str(Path(speaker_files[0]).parent)
-                    job.save()
-                    
-                    # Create speaker track records
-                    speaker_segments = {}
-                    for segment in transcription_result.get('segments', []):
-                        speaker = segment.get('speaker', 'UNKNOWN')
-                        if speaker not in speaker_segments:
-                            speaker_segments[speaker] = []
-                        speaker_segments[speaker].append(segment)
-                    
-                    # Create SpeakerTrack objects
-                    tracks_to_create = []
-                    for speaker_file in speaker_files:
-                        speaker_id = Path(speaker_file).stem
-                        
-                        # Calculate audio duration safely
-                        try:
-                            audio = AudioSegment.from_wav(speaker_file)
-                            duration_seconds = len(audio) / 1000.0
-                        except Exception as e:
-                            logger.warning(f"Could not calculate duration for {speaker_file}: {e}")
-                            duration_seconds = 0.0
-                        
-                        # Calculate word count
-                        segments = speaker_segments.get(speaker_id, [])
-                        word_count = sum(
-                            len(segment.get('text', '').split()) 
-                            for segment in segments
-                        )
-                        
-                        tracks_to_create.append(SpeakerTrack(
-                            job=job,
-                            speaker_id=speaker_id,
-                            audio_file_path=speaker_file,
-                            duration_seconds=duration_seconds,
-                            word_count=word_count
-                        ))
+                job = ProcessingJob(pk=ProcessingJob.objects.values_list('pk', flat=True).get(job_id=job_id))
+                
+                # Build the SpeakerTrack objects before opening the transaction
+                tracks_to_create = []
+                for speaker_file, duration_seconds in zip(speaker_files, durations):
+                    speaker_id = Path(speaker_file).stem
                     
-                    # Bulk create for better performance
-                    SpeakerTrack.objects.bulk_create(tracks_to_create)
+                    tracks_to_create.append(SpeakerTrack(
+                        job=job,
+                        speaker_id=speaker_id,
+                        audio_file_path=speaker_file,
+                        duration_seconds=duration_seconds,
+                        word_count=word_counts.get(speaker_id, 0)
+                    ))
+                
+                output_directory = str(Path(speaker_files[0]).parent) if speaker_files else None
+                
+                # Short transaction: one job UPDATE and batched INSERTs, no row lock
+                with transaction.atomic():
+                    ProcessingJob.objects.filter(pk=job.pk).update(
+                        speaker_count=len(speaker_files),
+                        output_directory=output_directory
+                    )
+                    # A retried job may already have some tracks (unique on job + speaker_id)
+                    SpeakerTrack.objects.bulk_create(
+                        tracks_to_create, batch_size=100, ignore_conflicts=True
+                    )
             
             await update_database()
             
@@ -223,13 +309,33 @@ class AudioProcessingService:
             logger.error(f"Error finalizing processing: {str(e)}")
             raise
     
+    @staticmethod
+    def get_wav_duration(wav_path: str) -> float:
+        """Read a WAV's duration from its header, falling back to ffprobe"""
+        try:
+            with wave.open(wav_path, 'rb') as wav_file:
+                return wav_file.getnframes() / wav_file.getframerate()
+        except (wave.Error, EOFError, OSError, ZeroDivisionError):
+            pass
+        
+        try:
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                 "-of", "csv=p=0", wav_path],
+                capture_output=True, text=True, timeout=30, check=True
+            )
+            return float(result.stdout.strip())
+        except Exception as e:
+            logger.warning(f"Could not calculate duration for {wav_path}: {e}")
+            return 0.0
+    
     async def run_separation_pipeline(self, job_id: str):
         """Main async pipeline for audio separation processing"""
         try:
             # Get job from database
             @sync_to_async
             def get_job():
-                return ProcessingJob.objects.get(job_id=job_id)
+                return ProcessingJob.objects.only('uploaded_file_path').get(job_id=job_id)
             
             job = await get_job()
             
@@ -260,9 +366,9 @@ class AudioProcessingService:
             @sync_to_async
             def update_error():
                 try:
-                    job = ProcessingJob.objects.get(job_id=job_id)
-                    job.error_message = str(e)[:500]  # Truncate long error messages
-                    job.save()
+                    ProcessingJob.objects.filter(job_id=job_id).update(
+                        error_message=str(e)[:500]  # Truncate long error messages
+                    )
                 except Exception as db_error:
                     logger.error(f"Could not update job error message: {str(db_error)}")
             
@@ -285,34 +391,44 @@ class AudioProcessingService:
     async def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """Get current job status with async database fallback"""
         try:
-            # Try to get from memory first (faster)
-            if job_id in job_statuses:
-                return job_statuses[job_id]
+            # Try the shared cache first (faster)
+            cached = await cache.aget(_status_key(job_id))
+            if cached is not None:
+                return cached
             
             # Fall back to database
             @sync_to_async
             def get_from_db():
-                try:
-                    job = ProcessingJob.objects.get(job_id=job_id)
-                    return {
+                # Single-flight: concurrent pollers wait here and reuse the first caller's result
+                with _status_lock(job_id):
+                    cached = cache.get(_status_key(job_id))
+                    if cached is not None:
+                        return cached
+                    
+                    try:
+                        job = ProcessingJob.objects.only(
+                            'status', 'current_step', 'progress_percentage'
+                        ).get(job_id=job_id)
+                    except ProcessingJob.DoesNotExist:
+                        return {
+                            'status': 'not_found',
+                            'step': 'error',
+                            'progress': 0,
+                            'message': 'Job not found'
+                        }
+                    
+                    status = {
                         'status': job.status,
                         'step': job.current_step,
                         'progress': job.progress_percentage,
                         'message': f"Current step: {job.get_current_step_display()}"
                     }
-                except ProcessingJob.DoesNotExist:
-                    return {
-                        'status': 'not_found',
-                        'step': 'error',
-                        'progress': 0,
-                        'message': 'Job not found'
-                    }
-            
-            status = await get_from_db()
+                    
+                    # Backfill the cache for the next poll
+                    cache.set(_status_key(job_id), status, STATUS_CACHE_TTL)
+                    return status
             
-            # Update memory cache
-            job_statuses[job_id] = status
-            return status
+            return await get_from_db()
             
         except Exception as e:
             logger.error(f"Error getting job status: {str(e)}")
@@ -338,16 +454,29 @@ async def start_processing_job_async(job_id: str):
 
 def start_processing_job(job_id: str):
     """Start processing job - wrapper for backwards compatibility"""
+    # Hand the job to the durable Celery queue when a broker is configured;
+    # the task id is the job id so the job can be revoked by id later
+    if getattr(settings, 'CELERY_BROKER_URL', None):
+        from .tasks import run_separation_pipeline
+        run_separation_pipeline.apply_async(args=[job_id], task_id=job_id)
+        logger.info(f"Queued Celery processing for job {job_id}")
+        return
+    
     # Use asyncio to run the async function
     try:
-        asyncio.create_task(start_processing_job_async(job_id))
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    
+    if loop is not None:
+        loop.create_task(start_processing_job_async(job_id))
         logger.info(f"Started async processing for job {job_id}")
-    except Exception as e:
-        # Fallback to thread-based processing for compatibility
-        import threading
+    else:
+        # Fallback to thread-based processing for compatibility; the thread owns a
+        # plain event loop instead of going through async_to_sync's loop-in-thread bridge
         def run_sync_job():
             try:
-                async_to_sync(audio_service.run_separation_pipeline)(job_id)
+                asyncio.run(audio_service.run_separation_pipeline(job_id))
             except Exception as thread_error:
                 logger.error(f"Thread-based processing failed: {str(thread_error)}")
         
@@ -375,7 +504,6 @@ def get_job_status(job_id: str) -> Dict[str, Any]:
         }
 
 
-@sync_to_async
 def update_speaker_label(job_id: str, speaker_id: str, new_label: str) -> bool:
     """Update speaker label with database transaction"""
     try:
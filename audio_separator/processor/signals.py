@@ -0,0 +1,30 @@
+"""
+Keep cached results pages and download paths in step with deleted or changed rows
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ProcessingJob, SpeakerTrack
+
+
+def _job_uuid(track):
+    """Public job_id of a track's job, without a query when the job is already loaded"""
+    if SpeakerTrack.job.is_cached(track):
+        return track.job.job_id
+    return ProcessingJob.objects.filter(pk=track.job_id).values_list('job_id', flat=True).first()
+
+
+@receiver(post_delete, sender=ProcessingJob)
+def drop_job_results(sender, instance, **kwargs):
+    # Imported lazily so management commands don't load the processing stack
+    from .services import invalidate_results_cache
+    invalidate_results_cache(instance.job_id)
+
+
+@receiver([post_save, post_delete], sender=SpeakerTrack)
+def drop_track_results(sender, instance, **kwargs):
+    from .services import invalidate_results_cache
+    job_uuid = _job_uuid(instance)
+    if job_uuid is not None:
+        invalidate_results_cache(job_uuid, [instance.speaker_id])
@@ -0,0 +1,13 @@
+import logging
+from asgiref.sync import async_to_sync
+from celery import shared_task
+from .services_refactored import audio_service
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True, ignore_result=True)
+def run_separation_pipeline(self, job_id: str):
+    """Run the separation pipeline for a job on a Celery worker"""
+    logger.info(f"Celery task {self.request.id} processing job {job_id}")
+    async_to_sync(audio_service.run_separation_pipeline)(job_id)
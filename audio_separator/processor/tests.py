@@ -1,3 +1,157 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import path
 
-# Create your tests here.
+from .models import ProcessingJob, SpeakerTrack
+from .services import audio_service, job_registry, results_cache_key
+from .views_refactored import StatusAPIView
+
+# StatusAPIView is not routed by processor.urls yet, so the tests mount it here
+urlpatterns = [
+    path('api/status/<uuid:job_id>/', StatusAPIView.as_view(), name='status_api'),
+]
+
+
+class JobStatusTests(TestCase):
+    """AudioProcessingService.get_job_status memory/database selection"""
+    
+    def setUp(self):
+        self.job = ProcessingJob.objects.create(
+            original_filename='talk.wav',
+            uploaded_file_path='/tmp/talk.wav',
+            file_size=2048,
+            status='completed',
+            current_step='completed',
+            progress_percentage=100,
+        )
+        self.job_id = str(self.job.job_id)
+        self.addCleanup(job_registry.clear, self.job_id, 'status', 'pk', 'future')
+    
+    def test_status_of_job_not_owned_by_this_process_comes_from_database(self):
+        # A stale in-memory status, e.g. from a job another worker has since finished
+        job_registry.set_status(self.job_id, {
+            'status': 'processing', 'step': 'transcribing', 'progress': 40, 'message': ''
+        })
+        
+        status = audio_service.get_job_status(self.job_id)
+        
+        self.assertEqual(status['status'], 'completed')
+    
+    def test_database_reads_are_not_cached_in_memory(self):
+        audio_service.get_job_status(self.job_id)
+        
+        self.assertIsNone(job_registry.get_status(self.job_id))
+
+
+class ResultsCacheTests(TestCase):
+    """Results page caching and its invalidation"""
+    
+    def setUp(self):
+        cache.clear()
+        self.job = ProcessingJob.objects.create(
+            original_filename='talk.wav',
+            uploaded_file_path='/tmp/talk.wav',
+            file_size=2048,
+            status='completed',
+            speaker_count=1,
+        )
+        self.track = SpeakerTrack.objects.create(
+            job=self.job,
+            speaker_id='SPEAKER_00',
+            audio_file_path='/tmp/SPEAKER_00.wav',
+            duration_seconds=3.0,
+        )
+        self.key = results_cache_key(self.job.job_id)
+    
+    def test_results_cache_holds_plain_values(self):
+        response = self.client.get(f'/results/{self.job.job_id}/')
+        
+        self.assertContains(response, 'SPEAKER_00')
+        job, tracks = cache.get(self.key)
+        self.assertIsInstance(job, dict)
+        self.assertEqual(tracks, [{
+            'speaker_id': 'SPEAKER_00',
+            'speaker_label': '',
+            'display_name': 'SPEAKER_00',
+            'duration_seconds': 3.0,
+            'word_count': None,
+        }])
+        
+        # Served from the cached values on the next request
+        self.assertContains(self.client.get(f'/results/{self.job.job_id}/'), 'talk.wav')
+    
+    def test_changed_track_invalidates_results(self):
+        self.client.get(f'/results/{self.job.job_id}/')
+        
+        self.track.speaker_label = 'Host'
+        self.track.save()
+        
+        self.assertIsNone(cache.get(self.key))
+    
+    def test_deleted_job_invalidates_results(self):
+        self.client.get(f'/results/{self.job.job_id}/')
+        
+        self.job.delete()
+        
+        self.assertIsNone(cache.get(self.key))
+
+
+class SecurityHeadersMiddlewareTests(TestCase):
+    """Headers added by the project middleware on a real request"""
+    
+    def test_index_response_carries_security_headers(self):
+        response = self.client.get('/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertEqual(response['Referrer-Policy'], 'strict-origin-when-cross-origin')
+        self.assertIn('Content-Security-Policy', response)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class StatusAPIViewTests(TestCase):
+    """Status polling through the async view"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = ProcessingJob.objects.create(
+            original_filename='talk.wav',
+            uploaded_file_path='/tmp/talk.wav',
+            file_size=2048,
+        )
+        cls.url = f'/api/status/{cls.job.job_id}/'
+    
+    def setUp(self):
+        # Cached statuses and the per-session rate limit live in the default cache
+        cache.clear()
+    
+    async def test_poll_returns_status_with_cache_control(self):
+        response = await self.async_client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'pending')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+    
+    async def test_unchanged_status_returns_not_modified(self):
+        first = await self.async_client.get(self.url, headers={'x-forwarded-for': '10.0.0.1'})
+        
+        # Another poller of the same job with the same ETag
+        response = await self.async_client.get(
+            self.url, headers={'x-forwarded-for': '10.0.0.2', 'if-none-match': first['ETag']}
+        )
+        
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+        self.assertIn('no-cache', response['Cache-Control'])
+    
+    async def test_rate_limit_is_per_client(self):
+        first = await self.async_client.get(self.url, headers={'x-forwarded-for': '10.0.0.1'})
+        other_client = await self.async_client.get(self.url, headers={'x-forwarded-for': '10.0.0.2'})
+        repeat = await self.async_client.get(self.url, headers={'x-forwarded-for': '10.0.0.1'})
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(other_client.status_code, 200)
+        self.assertEqual(repeat.status_code, 429)
+        self.assertEqual(repeat.json()['message'], 'Too many status requests')
@@ -1,18 +1,47 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, Http404, HttpResponse
+from django.http import JsonResponse, Http404, HttpResponse, HttpResponseNotModified, FileResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.urls import reverse
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
 import json
 import logging
 import os
 from .models import ProcessingJob, SpeakerTrack
 from .forms import FileUploadForm, SpeakerLabelForm
-from .services import audio_service, start_processing_job, get_job_status, update_speaker_label, cancel_job
+from .services import audio_service, start_processing_job, get_job_status, update_speaker_label, cancel_job, resolve_speaker_path
+from .services import results_cache_key, RESULTS_CACHE_TTL
 
 logger = logging.getLogger(__name__)
 
+# orjson parses the small AJAX payloads several times faster when it is installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _audio_file_response(file_path, filename=None):
+    """Stream a speaker track, handing it to nginx when X-Accel-Redirect is configured"""
+    accel_prefix = getattr(settings, 'AUDIO_ACCEL_REDIRECT_PREFIX', None)
+    if accel_prefix:
+        relative_path = os.path.relpath(file_path, settings.AUDIO_OUTPUT_PATH)
+        if not relative_path.startswith('..'):
+            response = HttpResponse(content_type='audio/wav')
+            response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{relative_path}"
+            if filename:
+                response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+    
+    return FileResponse(
+        open(file_path, 'rb'),
+        content_type='audio/wav',
+        as_attachment=filename is not None,
+        filename=filename
+    )
+
 
 def index(request):
     """Main upload page"""
@@ -106,17 +135,52 @@ def status_api(request, job_id):
         }, status=500)
 
 
+def _job_values(job):
+    """Plain values of a completed job shown on the results page"""
+    return {
+        'job_id': job.job_id,
+        'original_filename': job.original_filename,
+        'file_size': job.file_size,
+        'speaker_count': job.speaker_count,
+        'duration': job.duration,
+        'completed_at': job.completed_at,
+    }
+
+
+def _track_values(track):
+    """Plain values of a speaker track shown on the results page"""
+    return {
+        'speaker_id': track.speaker_id,
+        'speaker_label': track.speaker_label,
+        'display_name': track.display_name,
+        'duration_seconds': track.duration_seconds,
+        'word_count': track.word_count,
+    }
+
+
 def results(request, job_id):
     """Results page showing separated audio tracks"""
     try:
-        job = get_object_or_404(ProcessingJob, job_id=job_id)
-        
-        if job.status != 'completed':
-            return render(request, 'processor/error.html', {
-                'error_message': 'Processing not completed yet or failed.'
-            })
-        
-        speaker_tracks = SpeakerTrack.objects.filter(job=job).order_by('speaker_id')
+        cached = cache.get(results_cache_key(job_id))
+        if cached is None:
+            # Tracks and their job in one query; only a job without tracks needs a second
+            speaker_tracks = list(
+                SpeakerTrack.objects.filter(job__job_id=job_id)
+                .select_related('job')
+                .order_by('speaker_id')
+            )
+            job = speaker_tracks[0].job if speaker_tracks else get_object_or_404(ProcessingJob, job_id=job_id)
+            
+            if job.status != 'completed':
+                return render(request, 'processor/error.html', {
+                    'error_message': 'Processing not completed yet or failed.'
+                })
+            
+            # Cache only the values the template shows, never model instances
+            job, speaker_tracks = _job_values(job), [_track_values(track) for track in speaker_tracks]
+            cache.set(results_cache_key(job_id), (job, speaker_tracks), RESULTS_CACHE_TTL)
+        else:
+            job, speaker_tracks = cached
         
         return render(request, 'processor/results.html', {
             'job': job,
@@ -135,7 +199,7 @@ def results(request, job_id):
 def update_speaker_name(request, job_id):
     """Update speaker label via AJAX"""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         speaker_id = data.get('speaker_id')
         new_label = data.get('speaker_label', '').strip()
         
@@ -180,21 +244,12 @@ def update_speaker_name(request, job_id):
 def download_audio(request, job_id, speaker_id):
     """Download individual speaker audio file"""
     try:
-        job = get_object_or_404(ProcessingJob, job_id=job_id)
-        speaker_track = get_object_or_404(SpeakerTrack, job=job, speaker_id=speaker_id)
-        
-        if not os.path.exists(speaker_track.audio_file_path):
+        track = resolve_speaker_path(job_id, speaker_id)
+        if track is None or not os.path.exists(track['path']):
             raise Http404("Audio file not found")
         
-        # Determine filename for download
-        display_name = speaker_track.display_name.replace(' ', '_')
-        filename = f"{display_name}_{job.original_filename}"
-        
         # Serve file
-        with open(speaker_track.audio_file_path, 'rb') as audio_file:
-            response = HttpResponse(audio_file.read(), content_type='audio/wav')
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+        return _audio_file_response(track['path'], track['filename'])
     
     except Exception as e:
         logger.error(f"Download error: {str(e)}")
@@ -244,17 +299,22 @@ def cancel_job_view(request, job_id):
 def serve_audio(request, job_id, speaker_id):
     """Serve audio file for HTML5 audio player"""
     try:
-        job = get_object_or_404(ProcessingJob, job_id=job_id)
-        speaker_track = get_object_or_404(SpeakerTrack, job=job, speaker_id=speaker_id)
-        
-        if not os.path.exists(speaker_track.audio_file_path):
+        track = resolve_speaker_path(job_id, speaker_id)
+        if track is None or not os.path.exists(track['path']):
             raise Http404("Audio file not found")
         
-        # Serve audio file
-        with open(speaker_track.audio_file_path, 'rb') as audio_file:
-            response = HttpResponse(audio_file.read(), content_type='audio/wav')
-            response['Accept-Ranges'] = 'bytes'
-            return response
+        # Speaker files never change after finalize, so let the browser revalidate with a 304
+        stat = os.stat(track['path'])
+        etag = f'W/"{stat.st_mtime:.0f}-{stat.st_size}"'
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            # Serve audio file
+            response = _audio_file_response(track['path'])
+        
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=86400, immutable'
+        return response
     
     except Exception as e:
         logger.error(f"Serve audio error: {str(e)}")
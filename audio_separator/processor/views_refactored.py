@@ -1,63 +1,285 @@
 import json
+import hashlib
 import logging
 import mimetypes
 import os
+import re
+import time
+import threading
+from functools import lru_cache
+from pathlib import Path
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, Http404, HttpResponse, FileResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified, FileResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache
 from django.urls import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import content_disposition_header, parse_etags
 from django.views import View
-from asgiref.sync import sync_to_async, async_to_sync
 from .models import ProcessingJob, SpeakerTrack
 from .forms import FileUploadForm, SpeakerLabelForm
 from .services_refactored import (
     audio_service, start_processing_job, 
-    get_job_status, update_speaker_label
+    get_job_status_async, update_speaker_label
 )
 
 logger = logging.getLogger(__name__)
 
+# orjson encodes and decodes the small API payloads several times faster when installed;
+# its JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(data):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
 
-class SecurityMixin:
-    """Mixin for common security practices"""
+class ORJsonResponse(HttpResponse):
+    """JSON response serialised with orjson when available"""
     
-    def dispatch(self, request, *args, **kwargs):
-        # Add security headers
-        response = super().dispatch(request, *args, **kwargs)
-        if hasattr(response, '__setitem__'):
-            response['X-Content-Type-Options'] = 'nosniff'
-            response['X-Frame-Options'] = 'DENY'
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(_json_dumps(data), **kwargs)
+
+# Upload MIME types accepted by the extra security check
+_ALLOWED_AUDIO_MIMES = frozenset({
+    'audio/mpeg', 'audio/wav', 'audio/flac',
+    'audio/mp4', 'audio/aac', 'audio/ogg'
+})
+
+# Leading bytes of the accepted audio containers: MP3 (ID3), WAV, FLAC, OGG
+_AUDIO_SIGNATURES = (b'ID3', b'RIFF', b'fLaC', b'OggS')
+
+
+@lru_cache(maxsize=64)
+def _guess_mime_for_extension(extension):
+    return mimetypes.guess_type(f"upload{extension}")[0]
+
+
+# Directories speaker audio may be served from, resolved once at import
+_ALLOWED_AUDIO_ROOTS = (
+    Path(settings.AUDIO_OUTPUT_PATH).resolve(),
+    Path(settings.MEDIA_ROOT).resolve(),
+)
+
+
+def _is_safe_audio_path(file_path):
+    """Validate file path is within allowed directories"""
+    try:
+        real_path = Path(file_path).resolve()
+        return any(real_path.is_relative_to(root) for root in _ALLOWED_AUDIO_ROOTS)
+    except Exception:
+        return False
+
+
+# Upload limits shown on the index page, resolved once instead of per request
+_MAX_UPLOAD_MB = settings.MAX_UPLOAD_SIZE / (1024 * 1024)
+_ALLOWED_FORMATS_STR = ', '.join(settings.ALLOWED_AUDIO_FORMATS)
+
+# Placeholder reversed once per URL name; the URLconf imports this module, so resolve lazily
+_JOB_ID_PLACEHOLDER = '00000000-0000-0000-0000-000000000000'
+
+
+@lru_cache(maxsize=None)
+def _job_url_template(url_name):
+    return reverse(url_name, kwargs={'job_id': _JOB_ID_PLACEHOLDER}).replace(_JOB_ID_PLACEHOLDER, '{job_id}')
+
+
+def _job_url(url_name, job_id):
+    """reverse() for a job URL without walking the URLconf on every call"""
+    return _job_url_template(url_name).format(job_id=job_id)
+
+
+# Unbound forms carry no per-request state, so the results page shares one instance
+_EMPTY_SPEAKER_FORM = SpeakerLabelForm()
+
+# Speaker ids produced by diarization, e.g. SPEAKER_00
+_SPEAKER_ID_RE = re.compile(r'SPEAKER_?\d+', re.ASCII)
+
+# Characters dropped from download filenames, and spaces turned into underscores
+_FILENAME_STRIP_RE = re.compile(r'[^\w\s\-.]')
+_SPACE_TO_UNDERSCORE = str.maketrans(' ', '_')
+
+# Chunk size for streaming byte ranges of speaker audio
+_RANGE_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _parse_range(range_header, size):
+    """Return (start, end) for a single-range Range header, None if absent, or False if unsatisfiable"""
+    match = _RANGE_RE.match(range_header.strip()) if range_header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _iter_file_range(file_path, start, length):
+    with open(file_path, 'rb') as audio_file:
+        audio_file.seek(start)
+        while length > 0:
+            chunk = audio_file.read(min(_RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _accel_redirect_response(file_path):
+    """Hand a speaker track to nginx via X-Accel-Redirect, or None when that isn't configured"""
+    accel_prefix = getattr(settings, 'AUDIO_ACCEL_REDIRECT_PREFIX', None)
+    if not accel_prefix:
+        return None
+    relative_path = os.path.relpath(file_path, settings.AUDIO_OUTPUT_PATH)
+    if relative_path.startswith('..'):
+        return None
+    response = HttpResponse(content_type='audio/wav')
+    response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{relative_path}"
+    return response
+
+
+def _ranged_audio_response(request, file_path):
+    """Serve a WAV honouring a single byte Range so players can seek without refetching"""
+    # nginx sends the file with sendfile and answers Range requests itself
+    response = _accel_redirect_response(file_path)
+    if response is not None:
         return response
+    
+    size = os.stat(file_path).st_size
+    byte_range = _parse_range(request.META.get('HTTP_RANGE'), size)
+    
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        # FileResponse sets Content-Length, letting the server use sendfile
+        response = FileResponse(open(file_path, 'rb'), content_type='audio/wav')
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_file_range(file_path, start, end - start + 1),
+            status=206,
+            content_type='audio/wav'
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+# Rolling-window limiter run atomically in Redis: drop hits older than the window,
+# refuse when the window is full, otherwise record this hit. Returns 1 if allowed.
+_RATE_LIMIT_LUA = """
+local k = KEYS[1]
+local now = tonumber(ARGV[1])
+local win = tonumber(ARGV[2])
+local cap = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', k, 0, now - win * 1000)
+local n = redis.call('ZCARD', k)
+if n >= cap then return 0 end
+redis.call('ZADD', k, now, now .. ':' .. math.random())
+redis.call('PEXPIRE', k, win * 1000)
+return 1
+"""
+
+
+@lru_cache(maxsize=1)
+def _rate_limit_script():
+    """Register the limiter on the default cache's Redis connection, or None without Redis"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default').register_script(_RATE_LIMIT_LUA)
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def _redis_rate_limited(key, window, limit):
+    """Check and record a hit in Redis; None when Redis is not configured"""
+    script = _rate_limit_script()
+    if script is None:
+        return None
+    try:
+        return script(keys=[key], args=[int(time.time() * 1000), window, limit]) == 0
+    except Exception as e:
+        # Fail open rather than rejecting every request while Redis is down
+        logger.warning("Rate limiter unavailable: %s", e)
+        return False
+
+
+# Serialises the read-modify-write of the fallback limiter within this process
+_local_rate_limit_lock = threading.Lock()
+
+
+def _cache_rate_limited(key, window, limit):
+    """Rolling-window limiter on the default cache for deployments without Redis.
+    
+    Entries expire with the window and the cache caps its size, so memory stays
+    bounded however many clients there are.
+    """
+    now = time.time()
+    with _local_rate_limit_lock:
+        recent = [t for t in cache.get(key, ()) if now - t < window]
+        if len(recent) >= limit:
+            return True
+        recent.append(now)
+        cache.set(key, recent, window)
+        return False
+
+
+def _get_client_ip(request):
+    """Get client IP address safely"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0].strip()
+    else:
+        ip = request.META.get('REMOTE_ADDR', '')
+    return ip
 
 
 @method_decorator(never_cache, name='dispatch')
-class IndexView(SecurityMixin, View):
+class IndexView(View):
     """Main upload page with enhanced security"""
     
     def get(self, request):
         form = FileUploadForm()
         return render(request, 'processor/index.html', {
             'form': form,
-            'max_file_size_mb': settings.MAX_UPLOAD_SIZE / (1024 * 1024),
-            'allowed_formats': ', '.join(settings.ALLOWED_AUDIO_FORMATS),
+            'max_file_size_mb': _MAX_UPLOAD_MB,
+            'allowed_formats': _ALLOWED_FORMATS_STR,
             'csrf_token': request.META.get('CSRF_COOKIE'),
         })
 
 
-class FileUploadView(SecurityMixin, View):
+class FileUploadView(View):
     """Handle file upload with comprehensive validation and security"""
     
     def post(self, request):
         try:
             # Rate limiting check (basic implementation)
-            client_ip = self._get_client_ip(request)
+            client_ip = _get_client_ip(request)
             if self._is_rate_limited(client_ip):
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': False,
                     'error': 'Too many requests. Please wait before uploading again.'
                 }, status=429)
@@ -69,22 +291,22 @@ class FileUploadView(SecurityMixin, View):
                 
                 # Additional security validation
                 if not self._validate_file_security(uploaded_file):
-                    return JsonResponse({
+                    return ORJsonResponse({
                         'success': False,
                         'error': 'File failed security validation.'
                     }, status=400)
                 
                 # Create processing job
-                job = async_to_sync(audio_service.create_processing_job)(uploaded_file)
+                job = audio_service.create_processing_job(uploaded_file)
                 
                 # Start processing in background
                 start_processing_job(str(job.job_id))
                 
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': True,
                     'job_id': str(job.job_id),
                     'message': 'File uploaded successfully. Processing started.',
-                    'redirect_url': reverse('processor:status', kwargs={'job_id': job.job_id})
+                    'redirect_url': _job_url('processor:status', job.job_id)
                 })
             else:
                 # Return sanitized form errors
@@ -95,69 +317,44 @@ class FileUploadView(SecurityMixin, View):
                         sanitized_error = str(error)[:200]  # Limit length
                         errors.append(f"{field}: {sanitized_error}")
                 
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': False,
                     'errors': errors
                 }, status=400)
         
         except ValidationError as e:
-            logger.warning(f"Validation error during upload: {str(e)}")
-            return JsonResponse({
+            logger.warning("Validation error during upload: %s", e)
+            return ORJsonResponse({
                 'success': False,
                 'error': 'Invalid file or request data.'
             }, status=400)
-        except Exception as e:
-            logger.error(f"Upload error: {str(e)}")
-            return JsonResponse({
+        except Exception:
+            logger.exception("Upload error")
+            return ORJsonResponse({
                 'success': False,
                 'error': 'An unexpected error occurred. Please try again.'
             }, status=500)
     
-    def _get_client_ip(self, request):
-        """Get client IP address safely"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        return ip
-    
     def _is_rate_limited(self, client_ip):
-        """Basic rate limiting - in production use Redis/proper rate limiter"""
-        # Simple in-memory rate limiting (not suitable for production)
-        import time
-        from collections import defaultdict
-        
-        if not hasattr(self, '_rate_limit_cache'):
-            self._rate_limit_cache = defaultdict(list)
-        
-        now = time.time()
-        # Allow 3 uploads per minute per IP
-        recent_uploads = [t for t in self._rate_limit_cache[client_ip] if now - t < 60]
-        
-        if len(recent_uploads) >= 3:
-            return True
-        
-        recent_uploads.append(now)
-        self._rate_limit_cache[client_ip] = recent_uploads
-        return False
+        """Allow 3 uploads per minute per IP, shared across workers through Redis"""
+        key = f"rl:upload:{client_ip}"
+        limited = _redis_rate_limited(key, 60, 3)
+        if limited is None:
+            limited = _cache_rate_limited(key, 60, 3)
+        return limited
     
     def _validate_file_security(self, uploaded_file):
         """Additional security validation for uploaded files"""
         try:
-            # Check MIME type
-            detected_type = mimetypes.guess_type(uploaded_file.name)[0]
-            allowed_mimes = [
-                'audio/mpeg', 'audio/wav', 'audio/flac', 
-                'audio/mp4', 'audio/aac', 'audio/ogg'
-            ]
-            
-            if detected_type and detected_type not in allowed_mimes:
-                logger.warning(f"Rejected file with MIME type: {detected_type}")
+            # Check MIME type (it depends only on the extension)
+            detected_type = _guess_mime_for_extension(os.path.splitext(uploaded_file.name)[1].lower())
+            
+            if detected_type and detected_type not in _ALLOWED_AUDIO_MIMES:
+                logger.warning("Rejected file with MIME type: %s", detected_type)
                 return False
             
             # Check for null bytes (potential path traversal)
-            if b'\x00' in uploaded_file.name.encode('utf-8', errors='ignore'):
+            if '\x00' in uploaded_file.name:
                 logger.warning("Rejected file with null bytes in name")
                 return False
             
@@ -167,26 +364,19 @@ class FileUploadView(SecurityMixin, View):
             uploaded_file.seek(0)
             
             # Check for common audio file signatures
-            audio_signatures = [
-                b'ID3',  # MP3
-                b'RIFF', # WAV
-                b'fLaC', # FLAC
-                b'OggS', # OGG
-            ]
-            
-            if not any(header.startswith(sig) for sig in audio_signatures):
+            if not header.startswith(_AUDIO_SIGNATURES):
                 logger.warning("File does not have valid audio signature")
                 return False
             
             return True
             
-        except Exception as e:
-            logger.error(f"File security validation error: {str(e)}")
+        except Exception:
+            logger.exception("File security validation error")
             return False
 
 
 @method_decorator(never_cache, name='dispatch')
-class StatusView(SecurityMixin, View):
+class StatusView(View):
     """Processing status page with job ownership validation"""
     
     def get(self, request, job_id):
@@ -201,39 +391,58 @@ class StatusView(SecurityMixin, View):
                 'job': job,
                 'job_id': job_id
             })
-        except Exception as e:
-            logger.error(f"Status page error: {str(e)}")
+        except Exception:
+            logger.exception("Status page error")
             return render(request, 'processor/error.html', {
                 'error_message': 'Job not found or an error occurred.'
             })
 
 
-@method_decorator(never_cache, name='dispatch')
-class StatusAPIView(SecurityMixin, View):
+class StatusAPIView(View):
     """API endpoint for job status polling with rate limiting"""
     
-    def get(self, request, job_id):
+    async def get(self, request, job_id):
+        response = await self._status_response(request, job_id)
+        # Browsers may keep the status but must revalidate each poll, which the ETag turns into a 304.
+        # Set here, not with cache_control on the sync dispatch(), which would be handed a coroutine
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    async def _status_response(self, request, job_id):
+        """Build the status, 304 or error response for one poll"""
         try:
-            # Basic rate limiting for status checks
-            if self._is_status_rate_limited(request):
-                return JsonResponse({
+            # Basic rate limiting for status checks; Redis EVAL and the cache fallback
+            # block, so they run in a worker thread rather than on the event loop
+            if await sync_to_async(self._is_status_rate_limited)(request):
+                return ORJsonResponse({
                     'status': 'error',
                     'message': 'Too many status requests'
                 }, status=429)
             
-            status_info = get_job_status(job_id)
+            # Await the service directly instead of spinning up an event loop via async_to_sync
+            status_info = await get_job_status_async(str(job_id))
+            
+            # Unchanged progress since the last poll: headers only, nothing to serialise
+            etag = '"%s"' % hashlib.blake2b(
+                f"{status_info['status']}:{status_info.get('step')}:{status_info.get('progress')}".encode(),
+                digest_size=8
+            ).hexdigest()
+            if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
             
             # If job is completed, include redirect URL
             if status_info['status'] == 'completed':
-                status_info['redirect_url'] = reverse(
-                    'processor:results', kwargs={'job_id': job_id}
-                )
+                status_info['redirect_url'] = _job_url('processor:results', job_id)
             
-            return JsonResponse(status_info)
+            response = ORJsonResponse(status_info)
+            response['ETag'] = etag
+            return response
         
-        except Exception as e:
-            logger.error(f"Status API error: {str(e)}")
-            return JsonResponse({
+        except Exception:
+            logger.exception("Status API error")
+            return ORJsonResponse({
                 'status': 'error',
                 'step': 'error',
                 'progress': 0,
@@ -241,24 +450,19 @@ class StatusAPIView(SecurityMixin, View):
             }, status=500)
     
     def _is_status_rate_limited(self, request):
-        """Rate limit status checks - 1 request per second per session"""
-        import time
-        session_key = request.session.session_key or 'anonymous'
+        """Rate limit status checks - 1 request per second per session, or per client IP without one"""
+        # The app never creates sessions, so most pollers are told apart by IP
+        session_key = request.session.session_key
+        client = f"session:{session_key}" if session_key else f"ip:{_get_client_ip(request)}"
         
-        if not hasattr(self, '_status_cache'):
-            self._status_cache = {}
-        
-        now = time.time()
-        last_check = self._status_cache.get(session_key, 0)
-        
-        if now - last_check < 1:  # 1 second rate limit
-            return True
-        
-        self._status_cache[session_key] = now
-        return False
+        key = f"rl:status:{client}"
+        limited = _redis_rate_limited(key, 1, 1)
+        if limited is None:
+            limited = _cache_rate_limited(key, 1, 1)
+        return limited
 
 
-class ResultsView(SecurityMixin, View):
+class ResultsView(View):
     """Results page with job validation and security"""
     
     def get(self, request, job_id):
@@ -270,31 +474,34 @@ class ResultsView(SecurityMixin, View):
                     'error_message': 'Processing not completed yet or failed.'
                 })
             
-            speaker_tracks = SpeakerTrack.objects.filter(job=job).order_by('speaker_id')
+            # Only the columns results.html shows
+            speaker_tracks = SpeakerTrack.objects.filter(job=job).only(
+                'speaker_id', 'speaker_label', 'duration_seconds', 'word_count'
+            ).order_by('speaker_id')
             
             return render(request, 'processor/results.html', {
                 'job': job,
                 'speaker_tracks': speaker_tracks,
-                'form': SpeakerLabelForm()
+                'form': _EMPTY_SPEAKER_FORM
             })
         
-        except Exception as e:
-            logger.error(f"Results page error: {str(e)}")
+        except Exception:
+            logger.exception("Results page error")
             return render(request, 'processor/error.html', {
                 'error_message': 'Error loading results.'
             })
 
 
-class UpdateSpeakerNameView(SecurityMixin, View):
+class UpdateSpeakerNameView(View):
     """Update speaker label with comprehensive validation"""
     
     def post(self, request, job_id):
         try:
             # Parse JSON data safely
             try:
-                data = json.loads(request.body)
+                data = _json_loads(request.body)
             except (json.JSONDecodeError, UnicodeDecodeError):
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': False,
                     'error': 'Invalid JSON data'
                 }, status=400)
@@ -304,14 +511,14 @@ class UpdateSpeakerNameView(SecurityMixin, View):
             
             # Validate input lengths
             if len(speaker_id) > 50 or len(new_label) > 100:
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': False,
                     'error': 'Input too long'
                 }, status=400)
             
             # Validate speaker_id format
-            if not speaker_id or not speaker_id.replace('_', '').replace('SPEAKER', '').isdigit():
-                return JsonResponse({
+            if not _SPEAKER_ID_RE.fullmatch(speaker_id):
+                return ORJsonResponse({
                     'success': False,
                     'error': 'Invalid speaker ID format'
                 }, status=400)
@@ -323,15 +530,15 @@ class UpdateSpeakerNameView(SecurityMixin, View):
             })
             
             if form.is_valid():
-                success = async_to_sync(update_speaker_label)(job_id, speaker_id, new_label)
+                success = update_speaker_label(job_id, speaker_id, new_label)
                 
                 if success:
-                    return JsonResponse({
+                    return ORJsonResponse({
                         'success': True,
                         'message': 'Speaker name updated successfully'
                     })
                 else:
-                    return JsonResponse({
+                    return ORJsonResponse({
                         'success': False,
                         'error': 'Failed to update speaker name'
                     }, status=500)
@@ -341,31 +548,37 @@ class UpdateSpeakerNameView(SecurityMixin, View):
                     for error in field_errors:
                         errors.append(str(error)[:200])  # Sanitize and limit
                 
-                return JsonResponse({
+                return ORJsonResponse({
                     'success': False,
                     'errors': errors
                 }, status=400)
         
-        except Exception as e:
-            logger.error(f"Update speaker name error: {str(e)}")
-            return JsonResponse({
+        except Exception:
+            logger.exception("Update speaker name error")
+            return ORJsonResponse({
                 'success': False,
                 'error': 'An unexpected error occurred'
             }, status=500)
 
 
-class AudioDownloadView(SecurityMixin, View):
+class AudioDownloadView(View):
     """Secure audio file download with access control"""
     
     def get(self, request, job_id, speaker_id):
         try:
-            job = get_object_or_404(ProcessingJob, job_id=job_id)
-            speaker_track = get_object_or_404(SpeakerTrack, job=job, speaker_id=speaker_id)
+            # One joined query for the track and the job's filename
+            speaker_track = get_object_or_404(
+                SpeakerTrack.objects.select_related('job').only(
+                    'speaker_id', 'speaker_label', 'audio_file_path', 'job__original_filename'
+                ),
+                job__job_id=job_id, speaker_id=speaker_id
+            )
+            job = speaker_track.job
             
             # Validate file exists and is within allowed directory
             file_path = speaker_track.audio_file_path
-            if not self._is_safe_path(file_path):
-                logger.warning(f"Unsafe file path requested: {file_path}")
+            if not _is_safe_audio_path(file_path):
+                logger.warning("Unsafe file path requested: %s", file_path)
                 raise Http404("File not found")
             
             if not os.path.exists(file_path):
@@ -376,97 +589,74 @@ class AudioDownloadView(SecurityMixin, View):
             original_name = self._sanitize_filename(job.original_filename)
             filename = f"{display_name}_{original_name}.wav"
             
-            # Use FileResponse for efficient file serving
-            response = FileResponse(
-                open(file_path, 'rb'),
-                content_type='audio/wav',
-                as_attachment=True,
-                filename=filename
-            )
+            # Let nginx send the file when configured; otherwise FileResponse streams it
+            # through wsgi.file_wrapper, which servers implement with sendfile
+            response = _accel_redirect_response(file_path)
+            if response is not None:
+                response['Content-Disposition'] = content_disposition_header(True, filename)
+            else:
+                response = FileResponse(
+                    open(file_path, 'rb'),
+                    content_type='audio/wav',
+                    as_attachment=True,
+                    filename=filename
+                )
             
             # Add security headers
-            response['X-Content-Type-Options'] = 'nosniff'
             response['Content-Security-Policy'] = "default-src 'none'"
             
             return response
         
-        except Exception as e:
-            logger.error(f"Download error: {str(e)}")
-            raise Http404("File not found or error occurred")
-    
-    def _is_safe_path(self, file_path):
-        """Validate file path is within allowed directories"""
-        try:
-            real_path = os.path.realpath(file_path)
-            allowed_paths = [
-                os.path.realpath(settings.AUDIO_OUTPUT_PATH),
-                os.path.realpath(settings.MEDIA_ROOT)
-            ]
-            
-            return any(real_path.startswith(allowed) for allowed in allowed_paths)
+        except Http404:
+            raise
         except Exception:
-            return False
+            logger.exception("Download error")
+            raise Http404("File not found or error occurred")
     
     def _sanitize_filename(self, filename):
         """Sanitize filename for safe download"""
-        import re
         if not filename:
             return "audio"
         
         # Remove any potentially dangerous characters
-        sanitized = re.sub(r'[^\w\s\-_.]', '', filename)
-        sanitized = sanitized.replace(' ', '_')[:50]  # Limit length
+        sanitized = _FILENAME_STRIP_RE.sub('', filename.translate(_SPACE_TO_UNDERSCORE))[:50]  # Limit length
         
         return sanitized or "audio"
 
 
-class AudioServeView(SecurityMixin, View):
+class AudioServeView(View):
     """Secure audio file serving for HTML5 audio player"""
     
     def get(self, request, job_id, speaker_id):
         try:
-            job = get_object_or_404(ProcessingJob, job_id=job_id)
-            speaker_track = get_object_or_404(SpeakerTrack, job=job, speaker_id=speaker_id)
+            speaker_track = get_object_or_404(
+                SpeakerTrack.objects.only('audio_file_path'),
+                job__job_id=job_id, speaker_id=speaker_id
+            )
             
             file_path = speaker_track.audio_file_path
             
             # Validate file path security
-            if not self._is_safe_path(file_path):
-                logger.warning(f"Unsafe file path requested: {file_path}")
+            if not _is_safe_audio_path(file_path):
+                logger.warning("Unsafe file path requested: %s", file_path)
                 raise Http404("File not found")
             
             if not os.path.exists(file_path):
                 raise Http404("Audio file not found")
             
             # Serve audio file with proper headers
-            response = FileResponse(
-                open(file_path, 'rb'),
-                content_type='audio/wav'
-            )
+            response = _ranged_audio_response(request, file_path)
             
-            # Add security and caching headers
-            response['Accept-Ranges'] = 'bytes'
-            response['X-Content-Type-Options'] = 'nosniff'
+            # Add caching headers
             response['Cache-Control'] = 'private, max-age=3600'
             
             return response
         
-        except Exception as e:
-            logger.error(f"Serve audio error: {str(e)}")
-            raise Http404("Audio file not found")
-    
-    def _is_safe_path(self, file_path):
-        """Validate file path is within allowed directories"""
-        try:
-            real_path = os.path.realpath(file_path)
-            allowed_paths = [
-                os.path.realpath(settings.AUDIO_OUTPUT_PATH),
-                os.path.realpath(settings.MEDIA_ROOT)
-            ]
-            
-            return any(real_path.startswith(allowed) for allowed in allowed_paths)
+        except Http404:
+            raise
         except Exception:
-            return False
+            logger.exception("Serve audio error")
+            raise Http404("Audio file not found")
 
 
 # View function mappings for URL patterns
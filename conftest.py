@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures for the top-level integration tests
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def django_env():
+    """Configure Django once per session (per worker under pytest-xdist), only for the tests that need it"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'audio_separator.settings')
+    import django
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def service(django_env):
+    """Single AudioProcessingService shared by every test in the session"""
+    from processor.services import AudioProcessingService
+    return AudioProcessingService()
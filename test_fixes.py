@@ -44,7 +44,7 @@ def test_timeout_handlers():
         source = inspect.getsource(service.run_whisperx_transcription)
         
         assert "TimeoutError" in source, "Missing timeout error handling"
-        assert "signal.alarm" in source, "Missing timeout mechanism"
+        assert "future.result(timeout=" in source, "Missing timeout mechanism"
         print("[PASS] Timeout handling implemented in WhisperX")
         
     except Exception as e: